@@ -3,45 +3,57 @@ STONESOUP LangGraph Agent Infrastructure
 
 This package provides the complete agent workflow for document processing,
 including ingestion, extraction, story generation, and validation.
+
+Exports are resolved lazily (PEP 562): importing the package is cheap, and
+the heavy modules (LangGraph, LangChain, the node implementations) are only
+loaded the first time one of their names is accessed.
 """
 
-from .main_graph import StoneSoupWorkflow, create_workflow
-from .config import (
-    WorkflowConfig,
-    LLMConfig,
-    DocumentConfig,
-    ExtractionConfig,
-    StoryConfig,
-    ValidationConfig,
-    get_default_config,
-    load_config_from_file
-)
-from .state.agent_state import (
-    AgentState,
-    ProcessingStage,
-    ConfidenceScore,
-    DocumentMetadata,
-    ExtractedEntity,
-    StoryElement,
-    ValidationResult,
-    create_initial_state
-)
+import importlib
+from typing import Any, Dict, Tuple
+
+# Exported name -> (submodule relative to this package, attribute name)
+_LAZY_EXPORTS: Dict[str, Tuple[str, str]] = {
+    # Main workflow
+    "StoneSoupWorkflow": (".main_graph", "StoneSoupWorkflow"),
+    "create_workflow": (".main_graph", "create_workflow"),
+
+    # Configuration
+    "WorkflowConfig": (".config", "WorkflowConfig"),
+    "LLMConfig": (".config", "LLMConfig"),
+    "DocumentConfig": (".config", "DocumentConfig"),
+    "ExtractionConfig": (".config", "ExtractionConfig"),
+    "StoryConfig": (".config", "StoryConfig"),
+    "ValidationConfig": (".config", "ValidationConfig"),
+    "get_default_config": (".config", "get_default_config"),
+    "load_config_from_file": (".config", "load_config_from_file"),
+
+    # State models
+    "AgentState": (".state.agent_state", "AgentState"),
+    "ProcessingStage": (".state.agent_state", "ProcessingStage"),
+    "ConfidenceScore": (".state.agent_state", "ConfidenceScore"),
+    "DocumentMetadata": (".state.agent_state", "DocumentMetadata"),
+    "ExtractedEntity": (".state.agent_state", "ExtractedEntity"),
+    "StoryElement": (".state.agent_state", "StoryElement"),
+    "ValidationResult": (".state.agent_state", "ValidationResult"),
+    "create_initial_state": (".state.agent_state", "create_initial_state"),
+}
 
 __all__ = [
     # Main workflow
     "StoneSoupWorkflow",
     "create_workflow",
-    
+
     # Configuration
     "WorkflowConfig",
     "LLMConfig",
-    "DocumentConfig", 
+    "DocumentConfig",
     "ExtractionConfig",
     "StoryConfig",
     "ValidationConfig",
     "get_default_config",
     "load_config_from_file",
-    
+
     # State models
     "AgentState",
     "ProcessingStage",
@@ -53,4 +65,21 @@ __all__ = [
     "create_initial_state"
 ]
 
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name on first access and cache it on the package"""
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """Include lazily exported names in dir() and tab-completion"""
+    return sorted(set(globals()) | set(__all__))
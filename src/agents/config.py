@@ -5,12 +5,37 @@ This module defines configuration classes and defaults for the agent workflow,
 allowing customization of behavior, thresholds, and processing parameters.
 """
 
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+import copy
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Tuple
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from .nodes.base_node import NodeConfig
 
 
+# Default WorkflowConfig.quality_thresholds (a supplied dict replaces it)
+_DEFAULT_QUALITY_THRESHOLDS: Dict[str, float] = {
+    "minimum_extraction_entities": 3,
+    "minimum_extraction_facts": 5,
+    "minimum_story_length": 200,
+    "minimum_validation_score": 0.6,
+    "good_validation_score": 0.8,
+    "excellent_validation_score": 0.9
+}
+
+# Default ValidationConfig.criteria_weights (a supplied dict replaces it)
+_DEFAULT_CRITERIA_WEIGHTS: Dict[str, float] = {
+    "factual_accuracy": 0.3,
+    "narrative_coherence": 0.2,
+    "completeness": 0.2,
+    "clarity": 0.1,
+    "entity_coverage": 0.1,
+    "theme_integration": 0.1
+}
+
+
 class WorkflowConfig(BaseModel):
     """Main configuration for the STONESOUP workflow"""
     
@@ -37,6 +62,10 @@ class WorkflowConfig(BaseModel):
         default=True,
         description="Enable state checkpointing"
     )
+    split_camel_case: bool = Field(
+        default=True,
+        description="Split camelCase words run together during ingestion (disable for clean text)"
+    )
     
     # Node configurations
     ingestion_config: NodeConfig = Field(
@@ -83,25 +112,22 @@ class WorkflowConfig(BaseModel):
         )
     )
     
+    # Validation behaviour (the node's own settings are validation_config)
+    validation_settings: "ValidationConfig" = Field(
+        default_factory=lambda: ValidationConfig(),
+        description="Validation criteria, thresholds and basic-validation band"
+    )
+    
     # Performance settings
     batch_size: int = Field(default=10, description="Batch size for concurrent processing")
     max_concurrent: int = Field(default=5, description="Maximum concurrent document processing")
     
     # Quality thresholds
     quality_thresholds: Dict[str, float] = Field(
-        default_factory=lambda: {
-            "minimum_extraction_entities": 3,
-            "minimum_extraction_facts": 5,
-            "minimum_story_length": 200,
-            "minimum_validation_score": 0.6,
-            "good_validation_score": 0.8,
-            "excellent_validation_score": 0.9
-        }
+        default_factory=lambda: dict(_DEFAULT_QUALITY_THRESHOLDS)
     )
     
-    class Config:
-        """Pydantic configuration"""
-        validate_assignment = True
+    model_config = ConfigDict(validate_assignment=True)
 
 
 class LLMConfig(BaseModel):
@@ -270,14 +296,7 @@ class ValidationConfig(BaseModel):
     
     # Validation criteria weights
     criteria_weights: Dict[str, float] = Field(
-        default_factory=lambda: {
-            "factual_accuracy": 0.3,
-            "narrative_coherence": 0.2,
-            "completeness": 0.2,
-            "clarity": 0.1,
-            "entity_coverage": 0.1,
-            "theme_integration": 0.1
-        },
+        default_factory=lambda: dict(_DEFAULT_CRITERIA_WEIGHTS),
         description="Weights for different validation criteria"
     )
     
@@ -319,6 +338,74 @@ class ValidationConfig(BaseModel):
         le=1.0,
         description="Minimum percentage of facts to include"
     )
+    
+    # Basic-validation band: with both set, basic checks run before the LLM
+    # and a score below basic_fail_below, or at least basic_pass_from with no
+    # errors, is settled without the LLM call
+    basic_fail_below: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Basic score below which validation fails without the LLM"
+    )
+    basic_pass_from: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Basic score from which validation passes without the LLM"
+    )
+    
+    @model_validator(mode="after")
+    def _check_basic_band(self) -> "ValidationConfig":
+        """Require both band edges (or neither), in order"""
+        if (self.basic_fail_below is None) != (self.basic_pass_from is None):
+            raise ValueError("basic_fail_below and basic_pass_from must be set together")
+        if self.basic_fail_below is not None and self.basic_fail_below > self.basic_pass_from:
+            raise ValueError("basic_fail_below must not exceed basic_pass_from")
+        return self
+    
+    @property
+    def basic_validation_band(self) -> Optional[Tuple[float, float]]:
+        """(fail_below, pass_from) for ValidationNode, or None when unset"""
+        if self.basic_fail_below is None:
+            return None
+        return (self.basic_fail_below, self.basic_pass_from)
+
+
+# WorkflowConfig refers to ValidationConfig, which is defined after it
+WorkflowConfig.model_rebuild()
+
+
+@lru_cache(maxsize=32)
+def _load_raw_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a configuration file into a plain dict.
+    
+    The file's modification time is part of the cache key, so repeated loads
+    of an unchanged file skip parsing while an edited file is re-read.
+    
+    Args:
+        path: Path to configuration file
+        mtime_ns: File modification time in nanoseconds (cache key only)
+        
+    Returns:
+        Parsed configuration data
+    """
+    suffix = Path(path).suffix
+    
+    if suffix == ".json":
+        with open(path, "rb") as f:
+            return json.load(f)
+    elif suffix in (".yaml", ".yml"):
+        # PyYAML is optional, so only import it when a YAML file is loaded
+        import yaml
+        
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(path, "r") as f:
+            return yaml.load(f, Loader=loader)
+    else:
+        raise ValueError(f"Unsupported configuration file format: {suffix}")
 
 
 def load_config_from_file(config_path: str) -> WorkflowConfig:
@@ -331,32 +418,29 @@ def load_config_from_file(config_path: str) -> WorkflowConfig:
     Returns:
         WorkflowConfig instance
     """
-    import json
-    import yaml
-    from pathlib import Path
-    
     path = Path(config_path)
     
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
-    if path.suffix == ".json":
-        with open(path, "r") as f:
-            config_data = json.load(f)
-    elif path.suffix in [".yaml", ".yml"]:
-        with open(path, "r") as f:
-            config_data = yaml.safe_load(f)
-    else:
-        raise ValueError(f"Unsupported configuration file format: {path.suffix}")
+    config_data = _load_raw_config(str(path), path.stat().st_mtime_ns)
     
-    return WorkflowConfig(**config_data)
+    # Each call still gets its own validated WorkflowConfig
+    return WorkflowConfig.model_validate(config_data)
 
 
-# Default configurations for different use cases
-DEFAULT_CONFIGS = {
-    "standard": WorkflowConfig(),
-    
-    "fast": WorkflowConfig(
+# Default configurations for different use cases.
+#
+# Each preset is a zero-argument factory rather than a ready-made instance so
+# that importing this module doesn't pay for validating four WorkflowConfigs
+# (and their nested NodeConfigs) up front. Presets are built on first use by
+# get_default_config and cached from then on as frozen singletons; the
+# public DEFAULT_CONFIGS mapping of instances is built on first access (see
+# __getattr__ below).
+
+def _fast_config() -> WorkflowConfig:
+    """Preset tuned for throughput: shorter timeouts, lower confidence bars"""
+    return WorkflowConfig(
         ingestion_config=NodeConfig(
             name="ingestion_node",
             description="Fast ingestion",
@@ -382,9 +466,12 @@ DEFAULT_CONFIGS = {
             timeout_seconds=60,
             required_confidence=0.7
         )
-    ),
-    
-    "quality": WorkflowConfig(
+    )
+
+
+def _quality_config() -> WorkflowConfig:
+    """Preset tuned for output quality: stricter thresholds, more retries"""
+    return WorkflowConfig(
         min_confidence_threshold=0.5,
         quality_thresholds={
             "minimum_extraction_entities": 5,
@@ -409,9 +496,12 @@ DEFAULT_CONFIGS = {
             temperature=0.9,
             max_retries=4
         )
-    ),
-    
-    "minimal": WorkflowConfig(
+    )
+
+
+def _minimal_config() -> WorkflowConfig:
+    """Preset that skips story generation and keeps retries to a minimum"""
+    return WorkflowConfig(
         skip_story_generation=True,
         min_confidence_threshold=0.2,
         ingestion_config=NodeConfig(
@@ -427,20 +517,114 @@ DEFAULT_CONFIGS = {
             timeout_seconds=60
         )
     )
+
+
+_PRESET_FACTORIES: Dict[str, Callable[[], WorkflowConfig]] = {
+    "standard": WorkflowConfig,
+    "fast": _fast_config,
+    "quality": _quality_config,
+    "minimal": _minimal_config,
 }
 
 
-def get_default_config(preset: str = "standard") -> WorkflowConfig:
+class _ReadOnlyDict(dict):
+    """dict that rejects modification, for mappings inside shared presets"""
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "Shared preset configs are read-only; "
+            "use get_default_config(preset) for a modifiable copy"
+        )
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __reduce__(self):
+        # Copies (copy.deepcopy, model_copy) and pickles come back as plain,
+        # modifiable dicts
+        return (dict, (dict(self),))
+
+
+class _PresetValidationConfig(ValidationConfig):
+    """Read-only ValidationConfig nested in the shared preset singletons"""
+    model_config = ConfigDict(frozen=True)
+
+
+class _PresetWorkflowConfig(WorkflowConfig):
+    """
+    Read-only WorkflowConfig used for the shared preset singletons.
+    
+    Frozen fields stop assignment; dict fields hold a _ReadOnlyDict and
+    validation_settings a _PresetValidationConfig, so the singleton can't be
+    changed through them either.
+    """
+    model_config = ConfigDict(frozen=True)
+
+
+@lru_cache(maxsize=None)
+def _build_preset(preset: str) -> WorkflowConfig:
+    """Build a preset once as a frozen singleton; later calls reuse it"""
+    config = _PRESET_FACTORIES[preset]()
+    values = dict(config)
+    values["quality_thresholds"] = _ReadOnlyDict(config.quality_thresholds)
+    validation_values = dict(config.validation_settings)
+    validation_values["criteria_weights"] = _ReadOnlyDict(
+        config.validation_settings.criteria_weights
+    )
+    values["validation_settings"] = _PresetValidationConfig.model_construct(
+        _fields_set=config.validation_settings.model_fields_set,
+        **validation_values
+    )
+    # Values were validated by the factory above, so skip a second pass
+    return _PresetWorkflowConfig.model_construct(
+        _fields_set=config.model_fields_set,
+        **values
+    )
+
+
+def get_default_config(preset: str = "standard", mutable: bool = True) -> WorkflowConfig:
     """
     Get a default configuration preset.
     
+    The preset is built (and validated) only the first time it is requested
+    and then kept as a frozen, shared singleton.
+    
     Args:
         preset: Configuration preset name
+        mutable: When True (the default) return a private deep copy that the
+            caller may modify freely. Pass False for read-only use to get the
+            shared singleton itself with no copying; assigning to its fields
+            raises a validation error.
         
     Returns:
         WorkflowConfig instance
     """
-    if preset not in DEFAULT_CONFIGS:
-        raise ValueError(f"Unknown preset: {preset}. Available: {list(DEFAULT_CONFIGS.keys())}")
+    if preset not in _PRESET_FACTORIES:
+        raise ValueError(f"Unknown preset: {preset}. Available: {list(_PRESET_FACTORIES.keys())}")
+    
+    shared = _build_preset(preset)
+    if not mutable:
+        return shared
     
-    return DEFAULT_CONFIGS[preset].copy()
\ No newline at end of file
+    # Rebuild as a plain (unfrozen) WorkflowConfig around deep-copied values,
+    # including the nested ValidationConfig
+    values = copy.deepcopy(dict(shared))
+    values["validation_settings"] = ValidationConfig.model_construct(
+        _fields_set=shared.validation_settings.model_fields_set,
+        **dict(values["validation_settings"])
+    )
+    return WorkflowConfig.model_construct(
+        _fields_set=shared.model_fields_set,
+        **values
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Build DEFAULT_CONFIGS (preset name -> WorkflowConfig) on first access"""
+    if name == "DEFAULT_CONFIGS":
+        # Plain instances the caller may modify, independent of the shared
+        # singletons behind get_default_config
+        value = {preset: factory() for preset, factory in _PRESET_FACTORIES.items()}
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,9 +5,13 @@ from .router import (
     route_after_extraction,
     route_after_story_generation,
     route_after_validation,
+    complete_without_story,
+    prepare_extraction_retry,
+    prepare_story_generation_retry,
     should_continue,
     get_next_node,
     create_conditional_edges,
+    build_routers,
     handle_error_routing
 )
 
@@ -16,8 +20,12 @@ __all__ = [
     "route_after_extraction", 
     "route_after_story_generation",
     "route_after_validation",
+    "complete_without_story",
+    "prepare_extraction_retry",
+    "prepare_story_generation_retry",
     "should_continue",
     "get_next_node",
     "create_conditional_edges",
+    "build_routers",
     "handle_error_routing"
 ]
\ No newline at end of file
@@ -5,82 +5,151 @@ This module defines the edge functions and routing logic that determines
 how the workflow transitions between different nodes based on state.
 """
 
-from typing import Literal, Dict, Any, List
+from types import MappingProxyType
+from typing import Literal, Dict, Any, List, Callable, Mapping, Optional, TYPE_CHECKING
 import logging
 
-from ..state.agent_state import AgentState, ProcessingStage, should_continue_processing
+from ..state.agent_state import (
+    AgentState,
+    ProcessingStage,
+    add_error_message,
+    should_continue_processing
+)
+
+if TYPE_CHECKING:
+    from ..config import WorkflowConfig
 
 
 logger = logging.getLogger("stonesoup.router")
 
+# Defaults used by should_continue when agent_context doesn't override them
+_DEFAULT_MIN_CONFIDENCE = 0.2
+_DEFAULT_MAX_ERRORS = 10
+
+# Stages bound to module names: one global lookup instead of a global plus
+# an attribute lookup on the enum. Terminal checks use identity comparisons.
+_INGESTION = ProcessingStage.INGESTION
+_EXTRACTION = ProcessingStage.EXTRACTION
+_STORY_GENERATION = ProcessingStage.STORY_GENERATION
+_VALIDATION = ProcessingStage.VALIDATION
+_COMPLETED = ProcessingStage.COMPLETED
+_FAILED = ProcessingStage.FAILED
+
+# Node name for each stage (the enum value), cached to skip the descriptor lookup
+_STAGE_NAME: Dict[ProcessingStage, str] = {stage: stage.value for stage in ProcessingStage}
+
+# Stage to fall back to when an error asks to retry from the previous stage
+_STAGE_PREV: Dict[ProcessingStage, ProcessingStage] = {
+    _EXTRACTION: _INGESTION,
+    _STORY_GENERATION: _EXTRACTION,
+    _VALIDATION: _STORY_GENERATION,
+}
+
+
+# Routers only decide where to go next and never modify the state: LangGraph
+# hands edge functions a read-only snapshot, so writes made there are lost.
+# State changes needed on a retry path are applied by the small
+# prepare_*_retry nodes below, which the graph places on those edges.
 
-def route_after_ingestion(state: AgentState) -> Literal["extraction", "end"]:
+
+def route_after_ingestion(
+    state: AgentState,
+    *,
+    min_confidence: Optional[float] = None
+) -> Literal["extraction", "end"]:
     """
     Route after ingestion node completes.
     
     Args:
         state: Current agent state
+        min_confidence: Fixed confidence threshold (see build_routers).
+            When None it is read from agent_context.
         
     Returns:
         Next node to execute
     """
+    # Read each state field once; routers run on every node transition
+    doc_id = state["document_id"]
+    info_enabled = logger.isEnabledFor(logging.INFO)
+    
+    # Every check below ends the workflow, so run the cheapest first.
+    # Check confidence threshold (a single float compare)
+    scores = state["confidence_scores"]
+    if scores.overall < 0.3:
+        logger.warning("Low confidence after ingestion: %s", scores)
+        return "end"
+    
     # Check if we should continue processing
-    if not should_continue_processing(state):
-        logger.info(f"Ending workflow after ingestion for {state['document_id']}")
+    if not should_continue_processing(state, min_confidence):
+        if info_enabled:
+            logger.info("Ending workflow after ingestion for %s", doc_id)
         return "end"
     
     # Check if we have processed content
     if not state.get("processed_content"):
-        logger.error(f"No processed content available for {state['document_id']}")
-        return "end"
-    
-    # Check confidence threshold
-    if state["confidence_scores"].overall < 0.3:
-        logger.warning(
-            f"Low confidence after ingestion: {state['confidence_scores'].overall}"
-        )
+        logger.error("No processed content available for %s", doc_id)
         return "end"
     
     # Proceed to extraction
-    logger.info(f"Routing to extraction for {state['document_id']}")
+    if info_enabled:
+        logger.info("Routing to extraction for %s", doc_id)
     return "extraction"
 
 
-def route_after_extraction(state: AgentState) -> Literal["story_generation", "validation", "end"]:
+def route_after_extraction(
+    state: AgentState,
+    *,
+    min_confidence: Optional[float] = None,
+    skip_story_generation: Optional[bool] = None
+) -> Literal["story_generation", "validation", "end"]:
     """
     Route after extraction node completes.
     
     Args:
         state: Current agent state
+        min_confidence: Fixed confidence threshold (see build_routers).
+            When None it is read from agent_context.
+        skip_story_generation: Fixed skip flag (see build_routers).
+            When None it is read from agent_context.
         
     Returns:
         Next node to execute
     """
+    doc_id = state["document_id"]
+    info_enabled = logger.isEnabledFor(logging.INFO)
+    
     # Check if we should continue
-    if not should_continue_processing(state):
-        logger.info(f"Ending workflow after extraction for {state['document_id']}")
+    if not should_continue_processing(state, min_confidence):
+        if info_enabled:
+            logger.info("Ending workflow after extraction for %s", doc_id)
         return "end"
     
     # Check if we have enough extracted information
-    entity_count = len(state.get("extracted_entities", []))
-    fact_count = len(state.get("extracted_facts", []))
+    # Only call len() on lists that exist; no throwaway [] defaults
+    entities = state.get("extracted_entities")
+    facts = state.get("extracted_facts")
+    entity_count = len(entities) if entities else 0
+    fact_count = len(facts) if facts else 0
     
     if entity_count == 0 and fact_count == 0:
-        logger.warning(f"No entities or facts extracted for {state['document_id']}")
+        logger.warning("No entities or facts extracted for %s", doc_id)
         # Skip story generation and go to validation
         return "validation"
     
     # Check if story generation should be skipped (based on context)
-    skip_story = state["agent_context"].get("skip_story_generation", False)
-    if skip_story:
-        logger.info(f"Skipping story generation for {state['document_id']}")
+    if skip_story_generation is None:
+        skip_story_generation = state["agent_context"].get("skip_story_generation", False)
+    if skip_story_generation:
+        if info_enabled:
+            logger.info("Skipping story generation for %s", doc_id)
         return "validation"
     
     # Proceed to story generation
-    logger.info(
-        f"Routing to story generation for {state['document_id']} "
-        f"(entities: {entity_count}, facts: {fact_count})"
-    )
+    if info_enabled:
+        logger.info(
+            "Routing to story generation for %s (entities: %d, facts: %d)",
+            doc_id, entity_count, fact_count
+        )
     return "story_generation"
 
 
@@ -94,25 +163,33 @@ def route_after_story_generation(state: AgentState) -> Literal["validation", "ex
     Returns:
         Next node to execute
     """
-    # Check if we should retry due to low quality
-    if state.get("should_retry") and state["retry_count"] < state["max_retries"]:
-        retry_from = state["agent_context"].get("retry_from_stage", "extraction")
-        
-        if retry_from == "extraction":
-            logger.info(
-                f"Retrying from extraction for {state['document_id']} "
-                f"(attempt {state['retry_count'] + 1})"
-            )
-            state["current_stage"] = ProcessingStage.EXTRACTION
+    doc_id = state["document_id"]
+    
+    # Check if we should retry due to low quality. The retry counters and
+    # context are only read when a retry was actually requested.
+    if state.get("should_retry"):
+        retry_count = state["retry_count"]
+        if (
+            retry_count < state["max_retries"]
+            and state["agent_context"].get("retry_from_stage", "extraction") == "extraction"
+        ):
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Retrying from extraction for %s (attempt %d)",
+                    doc_id, retry_count + 1
+                )
+            # The graph sends this through prepare_extraction_retry, which
+            # resets the stage before extraction runs again
             return "extraction"
     
     # Check if narrative was generated
     if not state.get("generated_narrative"):
-        logger.warning(f"No narrative generated for {state['document_id']}")
+        logger.warning("No narrative generated for %s", doc_id)
         return "end"
     
     # Proceed to validation
-    logger.info(f"Routing to validation for {state['document_id']}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Routing to validation for %s", doc_id)
     return "validation"
 
 
@@ -126,38 +203,96 @@ def route_after_validation(state: AgentState) -> Literal["story_generation", "en
     Returns:
         Next node to execute
     """
+    doc_id = state["document_id"]
     validation_result = state.get("validation_result")
     
     if not validation_result:
-        logger.error(f"No validation result for {state['document_id']}")
+        logger.error("No validation result for %s", doc_id)
         return "end"
     
+    score = validation_result.score
+    
     # Check if validation passed
     if validation_result.is_valid:
-        logger.info(
-            f"Validation passed for {state['document_id']} "
-            f"(score: {validation_result.score:.2f})"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Validation passed for %s (score: %.2f)", doc_id, score)
         return "end"
     
     # Check if we should retry
-    if state.get("should_retry") and state["retry_count"] < state["max_retries"]:
-        logger.info(
-            f"Retrying story generation for {state['document_id']} "
-            f"(attempt {state['retry_count'] + 1})"
-        )
-        # Reset the should_retry flag
-        state["should_retry"] = False
+    retry_count = state["retry_count"]
+    if state.get("should_retry") and retry_count < state["max_retries"]:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Retrying story generation for %s (attempt %d)",
+                doc_id, retry_count + 1
+            )
+        # The graph sends this through prepare_story_generation_retry,
+        # which resets the should_retry flag
         return "story_generation"
     
     # Validation failed and no more retries
-    logger.warning(
-        f"Validation failed for {state['document_id']} "
-        f"(score: {validation_result.score:.2f})"
-    )
+    logger.warning("Validation failed for %s (score: %.2f)", doc_id, score)
     return "end"
 
 
+def prepare_extraction_retry(state: AgentState) -> Dict[str, Any]:
+    """
+    Node run on the story_generation -> extraction retry edge.
+    
+    Puts the document back in the extraction stage (ExtractionNode rejects
+    any other stage), clears the retry flag now that the retry is underway
+    and counts the attempt, so the router stops retrying at max_retries.
+    
+    Args:
+        state: Current agent state
+        
+    Returns:
+        Partial state update
+    """
+    return {
+        "current_stage": _EXTRACTION,
+        "should_retry": False,
+        "retry_count": state["retry_count"] + 1
+    }
+
+
+def prepare_story_generation_retry(state: AgentState) -> Dict[str, Any]:
+    """
+    Node run on the validation -> story_generation retry edge.
+    
+    ValidationNode has already moved the stage back to story generation;
+    this clears the retry flag now that the retry is underway and counts
+    the attempt, so the router stops retrying at max_retries.
+    
+    Args:
+        state: Current agent state
+        
+    Returns:
+        Partial state update
+    """
+    return {"should_retry": False, "retry_count": state["retry_count"] + 1}
+
+
+def complete_without_story(state: AgentState) -> Dict[str, Any]:
+    """
+    Node that ends a run after extraction when story generation is skipped.
+    
+    There is no narrative for ValidationNode to check, so the run is
+    complete if extraction found anything and failed otherwise.
+    
+    Args:
+        state: Current agent state
+        
+    Returns:
+        Partial state update
+    """
+    if state.get("extracted_entities") or state.get("extracted_facts"):
+        return {"current_stage": _COMPLETED}
+    
+    logger.warning("No entities or facts extracted for %s", state["document_id"])
+    return {"current_stage": _FAILED}
+
+
 def should_continue(state: AgentState) -> bool:
     """
     Determine if the workflow should continue.
@@ -169,30 +304,60 @@ def should_continue(state: AgentState) -> bool:
         True if workflow should continue, False to end
     """
     # Check if we've reached a terminal stage
-    if state["current_stage"] in [ProcessingStage.COMPLETED, ProcessingStage.FAILED]:
+    current_stage = state["current_stage"]
+    if current_stage is _COMPLETED or current_stage is _FAILED:
         return False
     
+    # An empty context (the common case) means every threshold is a default
+    ctx = state["agent_context"]
+    if ctx:
+        min_confidence = ctx.get("min_confidence_threshold", _DEFAULT_MIN_CONFIDENCE)
+        max_errors = ctx.get("max_errors", _DEFAULT_MAX_ERRORS)
+    else:
+        min_confidence = _DEFAULT_MIN_CONFIDENCE
+        max_errors = _DEFAULT_MAX_ERRORS
+    
     # Check overall confidence
-    min_confidence = state["agent_context"].get("min_confidence_threshold", 0.2)
-    if state["confidence_scores"].overall < min_confidence:
+    scores = state["confidence_scores"]
+    overall = scores.overall
+    if overall < min_confidence:
         logger.warning(
-            f"Confidence below threshold for {state['document_id']}: "
-            f"{state['confidence_scores'].overall:.2f} < {min_confidence}"
+            "Confidence below threshold for %s: %s (min %s)",
+            state["document_id"], scores, min_confidence
         )
         return False
     
-    # Check error count
-    max_errors = state["agent_context"].get("max_errors", 10)
-    if len(state.get("error_messages", [])) > max_errors:
-        logger.error(
-            f"Too many errors for {state['document_id']}: "
-            f"{len(state['error_messages'])}"
-        )
+    # Check error count (error_count also covers trimmed messages; states
+    # from before it was tracked only have the message list)
+    error_count = state.get("error_count")
+    if error_count is None:
+        error_messages = state.get("error_messages")
+        error_count = len(error_messages) if error_messages else 0
+    if error_count > max_errors:
+        logger.error("Too many errors for %s: %d", state["document_id"], error_count)
         return False
     
     return True
 
 
+# Stage -> router dispatch table, built once at import time
+_ROUTE_TABLE: Dict[ProcessingStage, Callable[[AgentState], str]] = {
+    _INGESTION: route_after_ingestion,
+    _EXTRACTION: route_after_extraction,
+    _STORY_GENERATION: route_after_story_generation,
+    _VALIDATION: route_after_validation,
+}
+
+# Node name -> router mapping handed to LangGraph. It is shared by every
+# caller, so it is exposed through a read-only proxy.
+_CONDITIONAL_EDGES: Mapping[str, Any] = MappingProxyType({
+    "ingestion": route_after_ingestion,
+    "extraction": route_after_extraction,
+    "story_generation": route_after_story_generation,
+    "validation": route_after_validation,
+})
+
+
 def get_next_node(state: AgentState) -> str:
     """
     Main routing function that determines the next node based on current state.
@@ -205,30 +370,60 @@ def get_next_node(state: AgentState) -> str:
     """
     current_stage = state["current_stage"]
     
-    routing_map = {
-        ProcessingStage.INGESTION: route_after_ingestion,
-        ProcessingStage.EXTRACTION: route_after_extraction,
-        ProcessingStage.STORY_GENERATION: route_after_story_generation,
-        ProcessingStage.VALIDATION: route_after_validation,
-    }
+    router = _ROUTE_TABLE.get(current_stage)
+    if router is not None:
+        return router(state)
     
-    if current_stage in routing_map:
-        return routing_map[current_stage](state)
-    else:
-        logger.error(f"Unknown stage: {current_stage}")
-        return "end"
+    logger.error("Unknown stage: %s", current_stage)
+    return "end"
+
+
+def create_conditional_edges() -> Mapping[str, Any]:
+    """
+    Get the conditional edge configuration for LangGraph.
+    
+    The mapping is built once at import time and shared; it is read-only,
+    so copy it with dict(...) if you need to modify it.
+    
+    Returns:
+        Read-only mapping of conditional edge configurations
+    """
+    return _CONDITIONAL_EDGES
 
 
-def create_conditional_edges() -> Dict[str, Any]:
+def build_routers(config: "WorkflowConfig") -> Dict[str, Callable[[AgentState], str]]:
     """
-    Create conditional edge configuration for LangGraph.
+    Create conditional edge routers specialized for a fixed configuration.
+    
+    The generic routers look up min_confidence_threshold and
+    skip_story_generation in agent_context on every transition, even though
+    StoneSoupWorkflow copies both straight from its WorkflowConfig. The
+    closures returned here capture those values once, when the graph is
+    built, and every document routed by that graph reuses them.
     
+    Args:
+        config: Workflow configuration the graph is being built for
+        
     Returns:
-        Dictionary of conditional edge configurations
+        Dictionary of node name -> router, same shape as create_conditional_edges
     """
+    min_confidence = config.min_confidence_threshold
+    skip_story_generation = config.skip_story_generation
+    
+    def ingestion_router(state: AgentState) -> str:
+        return route_after_ingestion(state, min_confidence=min_confidence)
+    
+    def extraction_router(state: AgentState) -> str:
+        return route_after_extraction(
+            state,
+            min_confidence=min_confidence,
+            skip_story_generation=skip_story_generation
+        )
+    
     return {
-        "ingestion": route_after_ingestion,
-        "extraction": route_after_extraction,
+        "ingestion": ingestion_router,
+        "extraction": extraction_router,
+        # These two only depend on per-document state
         "story_generation": route_after_story_generation,
         "validation": route_after_validation,
     }
@@ -245,16 +440,17 @@ def handle_error_routing(state: AgentState, error: Exception) -> str:
     Returns:
         Next node to execute or "end"
     """
-    logger.error(
-        f"Error in {state['current_stage']} for {state['document_id']}: {error}"
-    )
+    current_stage = state["current_stage"]
+    retry_count = state["retry_count"]
+    
+    logger.error("Error in %s for %s: %s", current_stage, state["document_id"], error)
     
     # Add error to state
-    state["error_messages"].append(str(error))
+    add_error_message(state, str(error))
     
     # Check if we should retry
-    if state["retry_count"] < state["max_retries"]:
-        state["retry_count"] += 1
+    if retry_count < state["max_retries"]:
+        state["retry_count"] = retry_count + 1
         state["should_retry"] = True
         
         # Determine which node to retry
@@ -262,22 +458,14 @@ def handle_error_routing(state: AgentState, error: Exception) -> str:
         
         if retry_same_node:
             # Retry the same node
-            return state["current_stage"].value
+            return _STAGE_NAME[current_stage]
         else:
             # Go back to previous stage
-            stage_order = [
-                ProcessingStage.INGESTION,
-                ProcessingStage.EXTRACTION,
-                ProcessingStage.STORY_GENERATION,
-                ProcessingStage.VALIDATION
-            ]
-            
-            current_index = stage_order.index(state["current_stage"])
-            if current_index > 0:
-                previous_stage = stage_order[current_index - 1]
+            previous_stage = _STAGE_PREV.get(current_stage)
+            if previous_stage is not None:
                 state["current_stage"] = previous_stage
-                return previous_stage.value
+                return _STAGE_NAME[previous_stage]
     
     # No more retries, end workflow
-    state["current_stage"] = ProcessingStage.FAILED
+    state["current_stage"] = _FAILED
     return "end"
\ No newline at end of file
@@ -6,11 +6,13 @@ This script demonstrates how to use the agent workflow for document processing.
 
 import asyncio
 import logging
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
 
 from langchain_openai import ChatOpenAI
 
 from agents import (
+    StoneSoupWorkflow,
     create_workflow,
     get_default_config,
     WorkflowConfig,
@@ -25,22 +27,79 @@ logging.basicConfig(
 )
 
 
-async def process_single_document():
-    """Example of processing a single document"""
+@lru_cache(maxsize=None)
+def _get_llm(
+    model: str = "gpt-4",
+    temperature: float = 0.7,
+    workflow_id: Optional[str] = None
+) -> ChatOpenAI:
+    """
+    Get a shared LLM client, creating it on first use.
     
-    # Initialize LLM (replace with your preferred model)
-    llm = ChatOpenAI(
-        model="gpt-4",
-        temperature=0.7
-    )
+    Building a ChatOpenAI sets up an HTTP client, so examples that want the
+    same model settings reuse one instance (and its connection pool).
+    
+    If workflow_id is given, every request is tagged with it. All documents
+    in a batch send the same node system prompts, so an OpenAI-compatible
+    router (e.g. a vLLM deployment with workflow-aware routing) can keep the
+    batch on one instance and reuse its cached prompt prefix. Endpoints that
+    don't know these headers simply ignore them.
+    """
+    headers = None
+    if workflow_id:
+        headers = {
+            "x-workflow-id": workflow_id,
+            "x-routing-logic": "workflow_aware"
+        }
     
-    # Get default configuration (options: "standard", "fast", "quality", "minimal")
-    config = get_default_config("standard")
+    return ChatOpenAI(model=model, temperature=temperature, default_headers=headers)
+
+
+# Workflows handed out by _get_workflow, closed by _run_example before the
+# event loop shuts down
+_open_workflows: List[StoneSoupWorkflow] = []
+
+
+@lru_cache(maxsize=None)
+def _get_workflow(
+    preset: str = "standard",
+    checkpoint_path: Optional[str] = None,
+    workflow_id: Optional[str] = None
+) -> StoneSoupWorkflow:
+    """
+    Get a shared workflow for a config preset, creating it on first use.
     
-    # Create workflow
+    Caching by checkpoint_path also means examples that persist to the same
+    database share one SQLite checkpointer connection instead of reopening it.
+    """
     workflow = create_workflow(
-        config=config,
-        llm=llm,
+        config=get_default_config(preset, mutable=False),
+        llm=_get_llm(workflow_id=workflow_id),
+        checkpoint_path=checkpoint_path
+    )
+    _open_workflows.append(workflow)
+    return workflow
+
+
+async def _run_example(example) -> None:
+    """Run an example, then close the checkpointers of the shared workflows"""
+    try:
+        await example()
+    finally:
+        for workflow in _open_workflows:
+            await workflow.aclose()
+        _open_workflows.clear()
+        _get_workflow.cache_clear()
+
+
+async def process_single_document():
+    """Example of processing a single document"""
+    
+    # Get (or create) the workflow for a config preset
+    # (options: "standard", "fast", "quality", "minimal"). The preset is the
+    # shared read-only instance and the LLM client is reused across examples.
+    workflow = _get_workflow(
+        "standard",
         checkpoint_path="stonesoup_checkpoints.db"  # Optional: persist state
     )
     
@@ -71,7 +130,8 @@ async def process_single_document():
         context={
             "topic": "quantum computing",
             "priority": "high"
-        }
+        },
+        persist=True  # keep every step for check_workflow_state()
     )
     
     # Check results
@@ -106,10 +166,9 @@ async def process_single_document():
 async def process_batch_documents():
     """Example of processing multiple documents"""
     
-    # Initialize components
-    llm = ChatOpenAI(model="gpt-4", temperature=0.7)
-    config = get_default_config("fast")  # Use fast preset for batch processing
-    workflow = create_workflow(config=config, llm=llm)
+    # Use the fast preset for batch processing, with one LLM client for the
+    # whole batch tagged by a workflow id (see _get_llm)
+    workflow = _get_workflow("fast", workflow_id="fast-batch")
     
     # Example documents
     documents = [
@@ -165,16 +224,18 @@ async def custom_configuration_example():
         }
     )
     
-    # Customize node configurations
-    custom_config.extraction_config.required_confidence = 0.8
-    custom_config.extraction_config.timeout_seconds = 300
+    # Customize node configurations (node configs are frozen, so derive
+    # modified copies)
+    custom_config.extraction_config = custom_config.extraction_config.model_copy(
+        update={"required_confidence": 0.8, "timeout_seconds": 300}
+    )
     
-    custom_config.story_generation_config.temperature = 0.9
-    custom_config.story_generation_config.max_retries = 4
+    custom_config.story_generation_config = custom_config.story_generation_config.model_copy(
+        update={"temperature": 0.9, "max_retries": 4}
+    )
     
-    # Create workflow with custom config
-    llm = ChatOpenAI(model="gpt-4", temperature=0.7)
-    workflow = create_workflow(config=custom_config, llm=llm)
+    # Create workflow with custom config (the LLM client is still shared)
+    workflow = create_workflow(config=custom_config, llm=_get_llm())
     
     # Process document with custom settings
     final_state = await workflow.process_document(
@@ -188,21 +249,24 @@ async def custom_configuration_example():
     )
     
     print(f"\nCustom workflow completed: {final_state['current_stage']}")
+    
+    # This workflow isn't shared, so close its checkpointer here
+    await workflow.aclose()
 
 
 async def check_workflow_state():
     """Example of checking workflow state and history"""
     
-    llm = ChatOpenAI(model="gpt-4")
-    workflow = create_workflow(
-        llm=llm,
+    # Same preset and checkpoint database as the single-document example
+    workflow = _get_workflow(
+        "standard",
         checkpoint_path="stonesoup_checkpoints.db"
     )
     
     # Check state of a previous run
     thread_id = "doc_001"  # Use the document_id as thread_id
     
-    current_state = workflow.get_workflow_state(thread_id)
+    current_state = await workflow.aget_workflow_state(thread_id)
     if current_state:
         print(f"\nCurrent state for {thread_id}:")
         print(f"  Stage: {current_state['current_stage']}")
@@ -210,7 +274,7 @@ async def check_workflow_state():
         print(f"  Errors: {len(current_state['error_messages'])}")
     
     # Get history
-    history = workflow.get_workflow_history(thread_id)
+    history = await workflow.aget_workflow_history(thread_id)
     print(f"\nWorkflow history: {len(history)} states")
     for i, state in enumerate(history[-3:]):  # Show last 3 states
         print(f"  State {i}: {state['current_stage']}")
@@ -232,7 +296,7 @@ def main():
     
     if example in examples:
         print(f"Running {example} example...")
-        asyncio.run(examples[example]())
+        asyncio.run(_run_example(examples[example]))
     else:
         print(f"Unknown example: {example}")
         print(f"Available examples: {', '.join(examples.keys())}")
@@ -6,31 +6,69 @@ and edges to create the document processing pipeline.
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 import logging
-from datetime import datetime
+import time
 
+import aiosqlite
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langchain_core.language_models import BaseLLM
 
-from .state.agent_state import AgentState, create_initial_state, ProcessingStage
+from .state.agent_state import (
+    AgentState,
+    ProcessingStage,
+    add_error_message,
+    create_initial_state
+)
 from .nodes.ingestion_node import IngestionNode
 from .nodes.extraction_node import ExtractionNode
 from .nodes.story_generation_node import StoryGenerationNode
 from .nodes.validation_node import ValidationNode
 from .edges.router import (
-    route_after_ingestion,
-    route_after_extraction,
-    route_after_story_generation,
-    route_after_validation,
-    handle_error_routing
+    build_routers,
+    complete_without_story,
+    handle_error_routing,
+    prepare_extraction_retry,
+    prepare_story_generation_retry
 )
-from .config import WorkflowConfig
+from .config import WorkflowConfig, get_default_config
 
 
 logger = logging.getLogger("stonesoup.workflow")
 
+# Connection tuning applied to every checkpoint database (the saver itself
+# switches it to WAL): NORMAL sync skips the per-commit fsync that WAL makes
+# unnecessary, and busy_timeout waits out brief lock contention between
+# concurrent documents instead of failing.
+_CHECKPOINT_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+async def _make_checkpointer(path: Optional[str] = None) -> AsyncSqliteSaver:
+    """
+    Open a single tuned aiosqlite connection and wrap it in an AsyncSqliteSaver.
+    
+    The saver is bound to the running event loop, so it has to be created
+    from inside that loop (see StoneSoupWorkflow._get_app).
+    
+    Args:
+        path: Checkpoint database path (in-memory if not provided)
+        
+    Returns:
+        Checkpointer sharing one connection for all documents
+    """
+    conn = await aiosqlite.connect(path or ":memory:")
+    for pragma in _CHECKPOINT_PRAGMAS:
+        await conn.execute(pragma)
+    return AsyncSqliteSaver(conn)
+
 
 class StoneSoupWorkflow:
     """
@@ -47,7 +85,8 @@ class StoneSoupWorkflow:
         self,
         config: WorkflowConfig,
         llm: Optional[BaseLLM] = None,
-        checkpointer: Optional[SqliteSaver] = None
+        checkpointer: Optional[AsyncSqliteSaver] = None,
+        checkpoint_path: Optional[str] = None
     ):
         """
         Initialize the STONESOUP workflow.
@@ -56,15 +95,21 @@ class StoneSoupWorkflow:
             config: Workflow configuration
             llm: Language model for nodes to use
             checkpointer: Optional checkpointer for state persistence
+            checkpoint_path: Checkpoint database opened on first use when no
+                             checkpointer is given (in-memory if not provided)
         """
         self.config = config
         self.llm = llm
-        self.checkpointer = checkpointer or SqliteSaver.from_conn_string(":memory:")
+        self.checkpointer = checkpointer
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_owned = False
+        self._app_lock = asyncio.Lock()
         
         # Initialize nodes
         self.ingestion_node = IngestionNode(
             config=config.ingestion_config,
-            llm=llm
+            llm=llm,
+            split_camel_case=config.split_camel_case
         )
         
         self.extraction_node = ExtractionNode(
@@ -72,19 +117,57 @@ class StoneSoupWorkflow:
             llm=llm
         )
         
-        self.story_generation_node = StoryGenerationNode(
-            config=config.story_generation_config,
-            llm=llm
-        )
-        
-        self.validation_node = ValidationNode(
-            config=config.validation_config,
-            llm=llm
-        )
+        # Not built at all when the graph skips story generation; validation
+        # checks the generated narrative, so it is left out with it
+        self.story_generation_node = None
+        self.validation_node = None
+        if not config.skip_story_generation:
+            self.story_generation_node = StoryGenerationNode(
+                config=config.story_generation_config,
+                llm=llm
+            )
+            
+            self.validation_node = ValidationNode(
+                config=config.validation_config,
+                llm=llm,
+                basic_validation_band=config.validation_settings.basic_validation_band
+            )
         
         # Build the graph
         self.graph = self._build_graph()
-        self.app = self.graph.compile(checkpointer=self.checkpointer)
+        
+        # Compiled on first use when the checkpointer still has to be opened
+        self.app = None
+        if checkpointer is not None:
+            self.app = self.graph.compile(checkpointer=checkpointer)
+    
+    async def _get_app(self):
+        """
+        Compiled graph, opening the checkpoint database on first use.
+        
+        Returns:
+            Compiled LangGraph application
+        """
+        if self.app is None:
+            async with self._app_lock:
+                if self.app is None:
+                    if self.checkpointer is None:
+                        self.checkpointer = await _make_checkpointer(self._checkpoint_path)
+                        self._checkpoint_owned = True
+                    self.app = self.graph.compile(checkpointer=self.checkpointer)
+        return self.app
+    
+    async def aclose(self) -> None:
+        """
+        Close the checkpoint database if this workflow opened it.
+        
+        Call before the event loop shuts down; a checkpointer passed in by
+        the caller is left open for the caller to close.
+        """
+        if self.app is not None and self._checkpoint_owned:
+            await self.checkpointer.conn.close()
+            self.app = None
+            self.checkpointer = None
     
     def _build_graph(self) -> StateGraph:
         """
@@ -96,84 +179,88 @@ class StoneSoupWorkflow:
         # Create graph with AgentState
         workflow = StateGraph(AgentState)
         
-        # Add nodes
-        workflow.add_node("ingestion", self._wrap_node(self.ingestion_node))
-        workflow.add_node("extraction", self._wrap_node(self.extraction_node))
-        workflow.add_node("story_generation", self._wrap_node(self.story_generation_node))
-        workflow.add_node("validation", self._wrap_node(self.validation_node))
+        # Story generation is left out of the graph entirely when the
+        # config skips it, rather than being bypassed on every document
+        with_story = not self.config.skip_story_generation
+        
+        # Add nodes (BaseNode.__call__ handles errors and always returns a state)
+        workflow.add_node("ingestion", self.ingestion_node)
+        workflow.add_node("extraction", self.extraction_node)
+        if with_story:
+            workflow.add_node("story_generation", self.story_generation_node)
+            workflow.add_node("validation", self.validation_node)
+        else:
+            workflow.add_node("complete_without_story", complete_without_story)
+            workflow.add_edge("complete_without_story", END)
+        
+        # Retry edges pass through these small nodes, which apply the state
+        # changes a retry needs (routers themselves never modify state)
+        if with_story:
+            workflow.add_node("prepare_extraction_retry", prepare_extraction_retry)
+            workflow.add_node("prepare_story_generation_retry", prepare_story_generation_retry)
+            workflow.add_edge("prepare_extraction_retry", "extraction")
+            workflow.add_edge("prepare_story_generation_retry", "story_generation")
         
         # Set entry point
         workflow.set_entry_point("ingestion")
         
+        # Routers with this workflow's thresholds folded in as constants
+        routers = build_routers(self.config)
+        
         # Add conditional edges
         workflow.add_conditional_edges(
             "ingestion",
-            route_after_ingestion,
+            routers["ingestion"],
             {
                 "extraction": "extraction",
                 "end": END
             }
         )
         
-        workflow.add_conditional_edges(
-            "extraction",
-            route_after_extraction,
-            {
-                "story_generation": "story_generation",
-                "validation": "validation",
-                "end": END
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "story_generation",
-            route_after_story_generation,
-            {
-                "validation": "validation",
-                "extraction": "extraction",
-                "end": END
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "validation",
-            route_after_validation,
-            {
-                "story_generation": "story_generation",
-                "end": END
-            }
-        )
+        if with_story:
+            workflow.add_conditional_edges(
+                "extraction",
+                routers["extraction"],
+                {
+                    "story_generation": "story_generation",
+                    "validation": "validation",
+                    "end": END
+                }
+            )
+            
+            workflow.add_conditional_edges(
+                "story_generation",
+                routers["story_generation"],
+                {
+                    "validation": "validation",
+                    "extraction": "prepare_extraction_retry",
+                    "end": END
+                }
+            )
+            
+            workflow.add_conditional_edges(
+                "validation",
+                routers["validation"],
+                {
+                    "story_generation": "prepare_story_generation_retry",
+                    "end": END
+                }
+            )
+        else:
+            # The extraction router has skip_story_generation folded in and
+            # never returns "story_generation". Without a narrative there is
+            # nothing to validate, so the run ends after extraction.
+            workflow.add_conditional_edges(
+                "extraction",
+                routers["extraction"],
+                {
+                    "validation": "complete_without_story",
+                    "end": END
+                }
+            )
         
         return workflow
     
-    def _wrap_node(self, node):
-        """
-        Wrap a node with error handling.
-        
-        Args:
-            node: Node instance to wrap
-            
-        Returns:
-            Wrapped node function
-        """
-        async def wrapped(state: AgentState) -> AgentState:
-            try:
-                return await node(state)
-            except Exception as e:
-                logger.error(f"Error in {node.config.name}: {e}", exc_info=True)
-                
-                # Let the node's error handling take care of state updates
-                # but ensure we always return a state
-                if hasattr(e, "state"):
-                    return e.state
-                else:
-                    # Fallback error handling
-                    state["error_messages"].append(f"Error in {node.config.name}: {str(e)}")
-                    state["current_stage"] = ProcessingStage.FAILED
-                    return state
-        
-        return wrapped
-    
     async def process_document(
         self,
         document_id: str,
@@ -181,11 +268,16 @@ class StoneSoupWorkflow:
         source: str,
         document_type: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None,
-        thread_id: Optional[str] = None
+        thread_id: Optional[str] = None,
+        persist: bool = True
     ) -> AgentState:
         """
         Process a single document through the workflow.
         
+        By default a checkpoint is written after every node so the run's
+        history can be inspected (get_workflow_history) or resumed. Pass
+        persist=False to write only the final state.
+        
         Args:
             document_id: Unique document identifier
             content: Document content
@@ -193,18 +285,20 @@ class StoneSoupWorkflow:
             document_type: Type of document (optional)
             context: Additional context for processing (optional)
             thread_id: Thread ID for checkpointing (optional)
+            persist: Checkpoint every intermediate state (default True)
             
         Returns:
             Final agent state after processing
         """
-        logger.info(
-            f"Starting document processing",
-            extra={
-                "document_id": document_id,
-                "source": source,
-                "content_length": len(content)
-            }
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Starting document processing",
+                extra={
+                    "document_id": document_id,
+                    "source": source,
+                    "content_length": len(content)
+                }
+            )
         
         # Create initial state
         initial_state = create_initial_state(
@@ -231,24 +325,32 @@ class StoneSoupWorkflow:
         }
         
         # Run the workflow
-        start_time = datetime.utcnow()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Process through the graph
-            final_state = await self.app.ainvoke(initial_state, config)
+            app = await self._get_app()
+            # durability="exit" writes a single checkpoint when the run
+            # finishes instead of one per node
+            final_state = await app.ainvoke(
+                initial_state,
+                config,
+                durability=None if persist else "exit"
+            )
             
             # Log completion
-            duration = (datetime.utcnow() - start_time).total_seconds()
-            logger.info(
-                f"Document processing completed",
-                extra={
-                    "document_id": document_id,
-                    "duration_seconds": duration,
-                    "final_stage": final_state["current_stage"],
-                    "confidence": final_state["confidence_scores"].overall,
-                    "success": final_state["current_stage"] == ProcessingStage.COMPLETED
-                }
-            )
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Document processing completed",
+                    extra={
+                        "document_id": document_id,
+                        "duration_seconds": duration,
+                        "final_stage": final_state["current_stage"],
+                        "confidence": final_state["confidence_scores"].overall,
+                        "success": final_state["current_stage"] == ProcessingStage.COMPLETED
+                    }
+                )
             
             return final_state
             
@@ -260,75 +362,108 @@ class StoneSoupWorkflow:
             
             # Return state with error
             initial_state["current_stage"] = ProcessingStage.FAILED
-            initial_state["error_messages"].append(f"Workflow error: {str(e)}")
+            add_error_message(initial_state, f"Workflow error: {str(e)}")
             return initial_state
     
     async def process_batch(
         self,
         documents: List[Dict[str, Any]],
-        max_concurrent: int = 5
+        max_concurrent: Optional[int] = None,
+        persist_checkpoints: bool = False
     ) -> List[AgentState]:
         """
         Process multiple documents concurrently.
         
+        Documents are independent, so each one runs through the whole graph
+        on its own. A fixed pool of max_concurrent workers pulls them from a
+        queue, which bounds both how many are in flight (and so how many LLM
+        requests are outstanding) and how many coroutines exist at once.
+        
+        Batch runs are not resumed, so unlike process_document each
+        document writes only its final checkpoint by default.
+        
         Args:
             documents: List of document dictionaries with keys:
                        document_id, content, source, document_type, context
             max_concurrent: Maximum concurrent document processing
+                            (defaults to config.max_concurrent)
+            persist_checkpoints: Checkpoint every intermediate state
+                                 (default False)
             
         Returns:
             List of final states for each document
+            
+        Raises:
+            ValueError: If max_concurrent is less than 1
         """
-        logger.info(f"Starting batch processing of {len(documents)} documents")
-        
-        # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def process_with_semaphore(doc):
-            async with semaphore:
-                return await self.process_document(
-                    document_id=doc["document_id"],
-                    content=doc["content"],
-                    source=doc["source"],
-                    document_type=doc.get("document_type"),
-                    context=doc.get("context")
-                )
-        
-        # Process all documents
-        tasks = [process_with_semaphore(doc) for doc in documents]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Handle results
-        final_states = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Failed to process document {documents[i]['document_id']}: {result}")
-                # Create error state
-                error_state = create_initial_state(
-                    document_id=documents[i]["document_id"],
-                    raw_content=documents[i]["content"],
-                    source=documents[i]["source"]
-                )
-                error_state["current_stage"] = ProcessingStage.FAILED
-                error_state["error_messages"].append(str(result))
-                final_states.append(error_state)
-            else:
-                final_states.append(result)
+        if max_concurrent is None:
+            max_concurrent = self.config.max_concurrent
+        if max_concurrent < 1:
+            # With no workers nothing would drain the queue and every
+            # document would come back as None
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        
+        logger.info("Starting batch processing of %d documents", len(documents))
+        
+        pending: asyncio.Queue = asyncio.Queue()
+        for index, doc in enumerate(documents):
+            pending.put_nowait((index, doc))
+        
+        final_states: List[Optional[AgentState]] = [None] * len(documents)
+        
+        async def worker():
+            while True:
+                try:
+                    index, doc = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    final_states[index] = await self.process_document(
+                        document_id=doc["document_id"],
+                        content=doc["content"],
+                        source=doc["source"],
+                        document_type=doc.get("document_type"),
+                        context=doc.get("context"),
+                        persist=persist_checkpoints
+                    )
+                except Exception as e:
+                    logger.error("Failed to process document %s: %s", doc["document_id"], e)
+                    # Create error state
+                    error_state = create_initial_state(
+                        document_id=doc["document_id"],
+                        raw_content=doc["content"],
+                        source=doc["source"]
+                    )
+                    error_state["current_stage"] = ProcessingStage.FAILED
+                    add_error_message(error_state, str(e))
+                    final_states[index] = error_state
+        
+        # The queue is filled before the workers start, so each one simply
+        # exits once it finds it empty
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(max_concurrent, len(documents)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
         
         # Log summary
-        successful = sum(
-            1 for state in final_states
-            if state["current_stage"] == ProcessingStage.COMPLETED
-        )
-        
-        logger.info(
-            f"Batch processing completed",
-            extra={
-                "total": len(documents),
-                "successful": successful,
-                "failed": len(documents) - successful
-            }
-        )
+        if logger.isEnabledFor(logging.INFO):
+            successful = sum(
+                1 for state in final_states
+                if state["current_stage"] == ProcessingStage.COMPLETED
+            )
+            logger.info(
+                "Batch processing completed",
+                extra={
+                    "total": len(documents),
+                    "successful": successful,
+                    "failed": len(documents) - successful
+                }
+            )
         
         return final_states
     
@@ -336,12 +471,20 @@ class StoneSoupWorkflow:
         """
         Get the current state of a workflow thread.
         
+        The checkpointer runs on the event loop that processed the
+        documents, so this blocking call has to come from another thread.
+        From a coroutine, use aget_workflow_state.
+        
         Args:
             thread_id: Thread identifier
             
         Returns:
             Current state or None if not found
         """
+        if self.app is None:
+            # The checkpoint database is opened by the first run
+            return None
+        
         config = {"configurable": {"thread_id": thread_id}}
         
         try:
@@ -355,6 +498,51 @@ class StoneSoupWorkflow:
         """
         Get the history of states for a workflow thread.
         
+        Like get_workflow_state, this blocking call has to come from a
+        thread other than the workflow's event loop. From a coroutine, use
+        aget_workflow_history.
+        
+        Args:
+            thread_id: Thread identifier
+            
+        Returns:
+            List of historical states
+        """
+        if self.app is None:
+            return []
+        
+        config = {"configurable": {"thread_id": thread_id}}
+        
+        try:
+            return [state.values for state in self.app.get_state_history(config)]
+        except Exception as e:
+            logger.error(f"Failed to get history for thread {thread_id}: {e}")
+            return []
+    
+    async def aget_workflow_state(self, thread_id: str) -> Optional[AgentState]:
+        """
+        Get the current state of a workflow thread (async).
+        
+        Args:
+            thread_id: Thread identifier
+            
+        Returns:
+            Current state or None if not found
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        
+        try:
+            app = await self._get_app()
+            state = await app.aget_state(config)
+            return state.values if state else None
+        except Exception as e:
+            logger.error(f"Failed to get state for thread {thread_id}: {e}")
+            return None
+    
+    async def aget_workflow_history(self, thread_id: str) -> List[AgentState]:
+        """
+        Get the history of states for a workflow thread (async).
+        
         Args:
             thread_id: Thread identifier
             
@@ -364,40 +552,76 @@ class StoneSoupWorkflow:
         config = {"configurable": {"thread_id": thread_id}}
         
         try:
-            history = []
-            for state in self.app.get_state_history(config):
-                history.append(state.values)
-            return history
+            app = await self._get_app()
+            return [state.values async for state in app.aget_state_history(config)]
         except Exception as e:
             logger.error(f"Failed to get history for thread {thread_id}: {e}")
             return []
 
+# Workflows built by create_workflow(use_cache=True), keyed by (config
+# fingerprint, id(llm), checkpoint_path), least recently used first. Each
+# cached workflow holds a reference to its LLM, so the id() in a key can't
+# be recycled while the entry exists; the bound limits how many LLMs and
+# graphs the cache keeps alive.
+_WORKFLOW_CACHE: "OrderedDict[Tuple[str, int, Optional[str]], StoneSoupWorkflow]" = OrderedDict()
+_WORKFLOW_CACHE_SIZE = 8
+
+
+def _config_fingerprint(config: WorkflowConfig) -> str:
+    """Stable hash of a config's contents (independent of dict key order)"""
+    payload = json.dumps(config.model_dump(mode="json"), sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
 
 def create_workflow(
     config: Optional[WorkflowConfig] = None,
     llm: Optional[BaseLLM] = None,
-    checkpoint_path: Optional[str] = None
+    checkpoint_path: Optional[str] = None,
+    use_cache: bool = False
 ) -> StoneSoupWorkflow:
     """
     Factory function to create a STONESOUP workflow.
     
+    The graph for a given configuration never changes, so with use_cache
+    repeat calls with an equal config, the same LLM instance and the same
+    checkpoint path return the already-built (and compiled) workflow
+    instead of rebuilding it. A cached workflow runs on its own copy of the
+    config, so later changes to the caller's config don't leak into it.
+    
     Args:
         config: Workflow configuration (uses default if not provided)
         llm: Language model instance
         checkpoint_path: Path for checkpoint database
+        use_cache: Reuse a recently built workflow (sharing its
+                   checkpointer) when possible
         
     Returns:
         Configured StoneSoupWorkflow instance
     """
     if not config:
-        config = WorkflowConfig()
+        # The workflow only reads its config, so the shared preset is enough
+        config = get_default_config("standard", mutable=False)
     
-    checkpointer = None
-    if checkpoint_path:
-        checkpointer = SqliteSaver.from_conn_string(checkpoint_path)
+    cache_key = None
+    if use_cache:
+        cache_key = (_config_fingerprint(config), id(llm), checkpoint_path)
+        cached = _WORKFLOW_CACHE.get(cache_key)
+        if cached is not None:
+            _WORKFLOW_CACHE.move_to_end(cache_key)
+            return cached
+        
+        # Snapshot the config so the entry keeps matching its key
+        config = config.model_copy(deep=True)
     
-    return StoneSoupWorkflow(
+    workflow = StoneSoupWorkflow(
         config=config,
         llm=llm,
-        checkpointer=checkpointer
-    )
\ No newline at end of file
+        checkpoint_path=checkpoint_path
+    )
+    
+    if cache_key is not None:
+        _WORKFLOW_CACHE[cache_key] = workflow
+        if len(_WORKFLOW_CACHE) > _WORKFLOW_CACHE_SIZE:
+            _WORKFLOW_CACHE.popitem(last=False)
+    
+    return workflow
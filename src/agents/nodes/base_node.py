@@ -6,22 +6,104 @@ implementing common functionality for error handling, logging, and state managem
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, Optional, Type, List
 import asyncio
+import hashlib
 import logging
-from datetime import datetime
+import time
 import traceback
 
 from langchain_core.language_models import BaseLLM
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompt_values import PromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import BaseOutputParser
-from pydantic import BaseModel
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, ConfigDict
 
-from ..state.agent_state import AgentState, ProcessingStage, add_processing_event
+from ..state.agent_state import (
+    AgentState,
+    ProcessingStage,
+    add_error_message,
+    add_processing_event
+)
+
+
+# LLM types (BaseLanguageModel._llm_type) whose APIs only cache a prompt
+# prefix when it is explicitly marked. OpenAI and Gemini cache repeated
+# prefixes automatically, which our prompts get by putting the static
+# system instructions first.
+_EXPLICIT_PROMPT_CACHE_LLM_TYPES = frozenset({"anthropic-chat"})
+
+
+# Rough characters per token, used when no tokenizer is available
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """
+    tiktoken encoding for a model name.
+    
+    Args:
+        model: Model name ("" if unknown)
+        
+    Returns:
+        Encoding, or None if tiktoken or its BPE files are unavailable
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Unknown or non-OpenAI model: a close enough approximation
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def _mark_static_prefix(prompt_value: PromptValue) -> List[BaseMessage]:
+    """
+    Mark the system message of a formatted prompt as a cacheable prefix.
+    
+    Args:
+        prompt_value: Formatted prompt
+        
+    Returns:
+        Prompt messages with a cache breakpoint after the system message
+    """
+    messages = prompt_value.to_messages()
+    if messages and isinstance(messages[0], SystemMessage) and isinstance(messages[0].content, str):
+        messages[0] = SystemMessage(content=[{
+            "type": "text",
+            "text": messages[0].content,
+            "cache_control": {"type": "ephemeral"}
+        }])
+    return messages
+
+
+# Field names LLM responses use for confidence, in order of preference
+_CONFIDENCE_FIELDS = ("confidence", "confidence_score", "score", "certainty")
+
+# Sentinel for context lookups (None is a valid stored value)
+_MISSING = object()
+
+# Traceback entries kept in an error event's details
+_MAX_TRACEBACK_LINES = 20
 
 
 class NodeConfig(BaseModel):
-    """Configuration for a node"""
+    """
+    Configuration for a node.
+    
+    Frozen: nodes, and the create_workflow cache keyed on config contents,
+    assume a config never changes after construction. Use
+    model_copy(update=...) to derive a modified config.
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     name: str
     description: str
     max_retries: int = 3
@@ -43,6 +125,17 @@ class BaseNode(ABC):
     - Async operation support
     """
     
+    # Parsed LLM responses shared by all nodes, keyed by a digest of the
+    # node, model and fully formatted prompt (see invoke_llm_chain)
+    _response_cache: "OrderedDict[str, Any]" = OrderedDict()
+    _RESPONSE_CACHE_SIZE = 1024
+    
+    # Whether invoke_llm_chain caches responses even when the node samples
+    # (temperature > 0). Nodes whose LLM calls extract information rather
+    # than write text set this: the same input should give the same
+    # structured result, not a fresh sample on every retry.
+    cache_sampled_responses = False
+    
     def __init__(
         self,
         config: NodeConfig,
@@ -62,6 +155,18 @@ class BaseNode(ABC):
         self.logger = logger or logging.getLogger(f"stonesoup.{config.name}")
         self._execution_count = 0
         self._error_count = 0
+        # key -> "<node name>_<key>", built once per key instead of per access
+        self._context_keys: Dict[str, str] = {}
+        # Chains built by create_llm_chain, keyed by the ids of their parts.
+        # Each chain references those parts, so the ids can't be recycled.
+        self._chains: Dict[tuple, Any] = {}
+    
+    def _context_key(self, key: str) -> str:
+        """Namespaced agent_context key for this node"""
+        node_key = self._context_keys.get(key)
+        if node_key is None:
+            node_key = self._context_keys[key] = f"{self.config.name}_{key}"
+        return node_key
     
     @abstractmethod
     async def _process(self, state: AgentState) -> AgentState:
@@ -93,25 +198,30 @@ class BaseNode(ABC):
         """
         Execute the node with error handling and monitoring.
         
+        Errors never propagate: they are recorded on the state, which is
+        returned either way, so the graph can register nodes directly.
+        
         Args:
             state: Current agent state
             
         Returns:
             Updated agent state
         """
-        start_time = datetime.utcnow()
+        start_ns = time.perf_counter_ns()
         self._execution_count += 1
         
         try:
             # Log execution start
-            self.logger.info(
-                f"Starting {self.config.name} execution",
-                extra={
-                    "document_id": state["document_id"],
-                    "stage": state["current_stage"],
-                    "execution_count": self._execution_count
-                }
-            )
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "Starting %s execution",
+                    self.config.name,
+                    extra={
+                        "document_id": state["document_id"],
+                        "stage": state["current_stage"],
+                        "execution_count": self._execution_count
+                    }
+                )
             
             # Validate input
             validation_errors = self._validate_input(state)
@@ -129,7 +239,7 @@ class BaseNode(ABC):
                 result_state,
                 event_type=f"{self.config.name}_completed",
                 details={
-                    "duration_seconds": (datetime.utcnow() - start_time).total_seconds(),
+                    "duration_seconds": (time.perf_counter_ns() - start_ns) / 1e9,
                     "confidence": result_state["confidence_scores"].overall
                 },
                 success=True
@@ -141,19 +251,19 @@ class BaseNode(ABC):
             self._error_count += 1
             error_msg = f"{self.config.name} timed out after {self.config.timeout_seconds} seconds"
             self.logger.error(error_msg)
-            return self._handle_error(state, error_msg, start_time)
+            return self._handle_error(state, error_msg, start_ns)
             
         except Exception as e:
             self._error_count += 1
             error_msg = f"{self.config.name} failed: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
-            return self._handle_error(state, error_msg, start_time, exception=e)
+            return self._handle_error(state, error_msg, start_ns, exception=e)
     
     def _handle_error(
         self,
         state: AgentState,
         error_msg: str,
-        start_time: datetime,
+        start_ns: int,
         exception: Optional[Exception] = None
     ) -> AgentState:
         """
@@ -162,14 +272,20 @@ class BaseNode(ABC):
         Args:
             state: Current agent state
             error_msg: Error message
-            start_time: Execution start time
+            start_ns: Execution start (time.perf_counter_ns())
             exception: Exception instance (optional)
             
         Returns:
             Updated agent state with error information
         """
         # Add error to state
-        state["error_messages"].append(error_msg)
+        add_error_message(state, error_msg)
+        
+        # The full traceback already went to the log (exc_info=True); the
+        # event only keeps the innermost frames, and only when debugging
+        tb = None
+        if exception is not None and self.logger.isEnabledFor(logging.DEBUG):
+            tb = traceback.format_exception(exception)[-_MAX_TRACEBACK_LINES:]
         
         # Add error event
         add_processing_event(
@@ -177,8 +293,8 @@ class BaseNode(ABC):
             event_type=f"{self.config.name}_error",
             details={
                 "error": error_msg,
-                "duration_seconds": (datetime.utcnow() - start_time).total_seconds(),
-                "traceback": traceback.format_exc() if exception else None
+                "duration_seconds": (time.perf_counter_ns() - start_ns) / 1e9,
+                "traceback": tb
             },
             success=False
         )
@@ -200,6 +316,14 @@ class BaseNode(ABC):
         """
         Helper to create an LLM chain for use in node processing.
         
+        Node prompts keep their fixed instructions in the system message and
+        the per-document content in later messages. For providers that need
+        it, the system message is marked as a cacheable prefix so repeat
+        calls skip re-processing it.
+        
+        Chains are immutable, so each prompt/parser combination is wired up
+        once per node and reused on later calls.
+        
         Args:
             prompt_template: Prompt template for the chain
             output_parser: Optional output parser
@@ -210,13 +334,142 @@ class BaseNode(ABC):
         if not self.llm:
             raise ValueError(f"LLM not configured for {self.config.name}")
         
-        chain = prompt_template | self.llm
+        key = (id(prompt_template), id(output_parser), id(self.llm))
+        chain = self._chains.get(key)
+        if chain is not None:
+            return chain
+        
+        if getattr(self.llm, "_llm_type", None) in _EXPLICIT_PROMPT_CACHE_LLM_TYPES:
+            chain = prompt_template | RunnableLambda(_mark_static_prefix) | self.llm
+        else:
+            chain = prompt_template | self.llm
         
         if output_parser:
             chain = chain | output_parser
         
+        self._chains[key] = chain
         return chain
     
+    def _token_encoding(self):
+        """tiktoken encoding for this node's LLM (None if unavailable)"""
+        model = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None)
+        return _get_encoding(str(model) if model else "")
+    
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens text takes up for this node's LLM.
+        
+        Args:
+            text: Text to measure
+            
+        Returns:
+            Token count (estimated from length without a tokenizer)
+        """
+        encoding = self._token_encoding()
+        if encoding is None:
+            return -(-len(text) // _CHARS_PER_TOKEN)
+        return len(encoding.encode(text, disallowed_special=()))
+    
+    def truncate_to_tokens(
+        self,
+        text: str,
+        max_tokens: int,
+        keep_tail: bool = False
+    ) -> str:
+        """
+        Cut text down to a token budget for this node's LLM.
+        
+        A character limit over-truncates token-dense text and under-
+        truncates sparse text; counting tokens uses the real budget.
+        
+        Args:
+            text: Text to truncate
+            max_tokens: Token budget
+            keep_tail: Keep the first and last halves instead of the start
+            
+        Returns:
+            Text unchanged if within budget, otherwise truncated text
+        """
+        encoding = self._token_encoding()
+        
+        if encoding is None:
+            # No tokenizer: approximate the budget in characters
+            max_chars = max_tokens * _CHARS_PER_TOKEN
+            if len(text) <= max_chars:
+                return text
+            if keep_tail:
+                return text[:max_chars // 2] + "\n...\n" + text[-(max_chars // 2):]
+            return text[:max_chars] + "..."
+        
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        if keep_tail:
+            half = max_tokens // 2
+            return encoding.decode(tokens[:half]) + "\n...\n" + encoding.decode(tokens[-half:])
+        return encoding.decode(tokens[:max_tokens]) + "..."
+    
+    def _response_cache_key(
+        self,
+        prompt_template: ChatPromptTemplate,
+        inputs: Dict[str, Any],
+        output_parser: Optional[BaseOutputParser]
+    ) -> str:
+        """Digest of everything that determines an LLM response"""
+        llm = self.llm
+        model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+        parts = (
+            self.config.name,
+            getattr(llm, "_llm_type", type(llm).__name__),
+            str(model),
+            type(output_parser).__name__,
+            prompt_template.format(**inputs)
+        )
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    
+    async def invoke_llm_chain(
+        self,
+        prompt_template: ChatPromptTemplate,
+        inputs: Dict[str, Any],
+        output_parser: Optional[BaseOutputParser] = None
+    ) -> Any:
+        """
+        Run an LLM chain, reusing the response of an identical earlier call.
+        
+        Retries and re-routed passes often send a node the same content
+        again. With a deterministic node (temperature 0), or one that sets
+        cache_sampled_responses, the answer shouldn't change, so the parsed
+        response is served from a bounded LRU cache instead of calling the
+        LLM. Callers must treat the result as read-only since it may be
+        shared.
+        
+        Args:
+            prompt_template: Prompt template for the chain
+            inputs: Prompt variables
+            output_parser: Optional output parser
+            
+        Returns:
+            Chain output (parsed if an output parser is given)
+        """
+        chain = await self.create_llm_chain(prompt_template, output_parser)
+        
+        if self.config.temperature > 0.0 and not self.cache_sampled_responses:
+            # Sampled responses are meant to differ between calls
+            return await chain.ainvoke(inputs)
+        
+        cache = BaseNode._response_cache
+        key = self._response_cache_key(prompt_template, inputs, output_parser)
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        result = await chain.ainvoke(inputs)
+        cache[key] = result
+        if len(cache) > self._RESPONSE_CACHE_SIZE:
+            cache.popitem(last=False)
+        
+        return result
+    
     def extract_confidence_from_llm_response(
         self,
         response: Dict[str, Any],
@@ -233,13 +486,11 @@ class BaseNode(ABC):
             Confidence score between 0 and 1
         """
         # Try common confidence field names
-        confidence_fields = ["confidence", "confidence_score", "score", "certainty"]
-        
-        for field in confidence_fields:
-            if field in response:
+        for field in _CONFIDENCE_FIELDS:
+            value = response.get(field)
+            if value is not None:
                 try:
-                    confidence = float(response[field])
-                    return max(0.0, min(1.0, confidence))
+                    return max(0.0, min(1.0, float(value)))
                 except (ValueError, TypeError):
                     continue
         
@@ -260,14 +511,17 @@ class BaseNode(ABC):
         old_stage = state["current_stage"]
         state["current_stage"] = new_stage
         
-        self.logger.info(
-            f"Stage transition: {old_stage} -> {new_stage}",
-            extra={
-                "document_id": state["document_id"],
-                "old_stage": old_stage,
-                "new_stage": new_stage
-            }
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Stage transition: %s -> %s",
+                old_stage,
+                new_stage,
+                extra={
+                    "document_id": state["document_id"],
+                    "old_stage": old_stage,
+                    "new_stage": new_stage
+                }
+            )
     
     def add_context(
         self,
@@ -283,7 +537,7 @@ class BaseNode(ABC):
             key: Context key
             value: Context value
         """
-        state["agent_context"][f"{self.config.name}_{key}"] = value
+        state["agent_context"][self._context_key(key)] = value
     
     def get_context(
         self,
@@ -302,10 +556,12 @@ class BaseNode(ABC):
         Returns:
             Context value or default
         """
+        context = state["agent_context"]
+        
         # First check node-specific context
-        node_key = f"{self.config.name}_{key}"
-        if node_key in state["agent_context"]:
-            return state["agent_context"][node_key]
+        value = context.get(self._context_key(key), _MISSING)
+        if value is not _MISSING:
+            return value
         
         # Then check general context
-        return state["agent_context"].get(key, default)
\ No newline at end of file
+        return context.get(key, default)
\ No newline at end of file
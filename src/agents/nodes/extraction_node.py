@@ -6,8 +6,11 @@ using advanced NLP techniques and LLM-based analysis.
 """
 
 from typing import List, Dict, Any, Optional, Set
+import asyncio
+import logging
 import re
 from collections import Counter
+from functools import lru_cache
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
@@ -26,6 +29,90 @@ class ExtractionResult(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0, description="Extraction confidence")
 
 
+class BatchExtractionResult(BaseModel):
+    """Model for extraction results of several sections in one LLM call"""
+    sections: List[ExtractionResult] = Field(description="One extraction result per section, in section order")
+
+
+# Sections sent to the LLM together in one batched extraction call
+MAX_BATCHED_SECTIONS = 5
+
+# Token budget for the text sent to a single full-content extraction call
+EXTRACTION_MAX_TOKENS = 1000
+
+# Simple patterns for common entity types (basic extraction without LLM)
+_ENTITY_PATTERNS = {
+    "PERSON": re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?\b'),
+    "ORG": re.compile(r'\b[A-Z][A-Za-z]+(?:\s[A-Z][A-Za-z]+)*(?:\sInc\.?|\sCorp\.?|\sLLC|\sLtd\.?)\b'),
+    "LOC": re.compile(r'\b(?:New York|London|Paris|Tokyo|[A-Z][a-z]+(?:,\s*[A-Z]{2})?)\b'),
+    "TIME": re.compile(r'\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}|January|February|March|April|May|June|July|August|September|October|November|December)\b')
+}
+
+# spaCy pipeline used for basic entity extraction when installed (the
+# "nlp" extra); only NER is needed, so the other components are disabled
+SPACY_MODEL = "en_core_web_sm"
+_SPACY_DISABLED_PIPES = ["parser", "lemmatizer", "tagger", "attribute_ruler"]
+
+# spaCy entity labels -> our entity types (unlisted labels are skipped)
+_SPACY_LABELS = {
+    "PERSON": "PERSON",
+    "ORG": "ORG",
+    "GPE": "LOC",
+    "LOC": "LOC",
+    "FAC": "LOC",
+    "EVENT": "EVENT",
+    "DATE": "TIME",
+    "TIME": "TIME",
+    "PRODUCT": "PRODUCT",
+}
+
+# Normalized (uppercase) entity types for the spellings we expect, so the
+# common case reuses one string instead of upper-casing per entity
+_ENTITY_TYPE_NAMES = {
+    spelling: name
+    for name in ("PERSON", "ORG", "LOC", "EVENT", "TIME", "PRODUCT", "CONCEPT", "UNKNOWN")
+    for spelling in (name, name.lower(), name.capitalize())
+}
+
+
+@lru_cache(maxsize=1)
+def _load_spacy_pipeline():
+    """
+    Load the spaCy NER pipeline once per process.
+    
+    Returns:
+        spaCy Language, or None if spaCy or the model isn't installed
+    """
+    try:
+        import spacy
+        return spacy.load(SPACY_MODEL, disable=_SPACY_DISABLED_PIPES)
+    except (ImportError, OSError) as e:
+        logging.getLogger("stonesoup.extraction_node").info(
+            "spaCy NER unavailable (%s), using regex entity extraction", e
+        )
+        return None
+
+
+# Lowercase words, for theme word frequencies
+_WORD_RE = re.compile(r'\b[a-z]+\b')
+
+# A '.'-delimited sentence containing a fact indicator. The lookbehind pins
+# matches to sentence starts, so the scan never restarts mid-sentence.
+_FACT_SENTENCE_RE = re.compile(
+    r'(?:^|(?<=\.))[^.]*?(?:reported|announced|discovered|found|revealed|stated)[^.]*',
+    re.IGNORECASE
+)
+
+# Facts kept by basic extraction
+MAX_BASIC_FACTS = 10
+
+# Common words ignored when picking themes
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of',
+    'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were'
+})
+
+
 class ExtractionNode(BaseNode):
     """
     Node responsible for extracting structured information from documents.
@@ -37,6 +124,10 @@ class ExtractionNode(BaseNode):
     - Map relationships between entities
     """
     
+    # Extraction is idempotent: re-extracting the same content on a retry
+    # reuses the earlier result (see BaseNode.invoke_llm_chain)
+    cache_sampled_responses = True
+    
     def __init__(self, config: Optional[NodeConfig] = None, **kwargs):
         """Initialize extraction node with default config if not provided"""
         if not config:
@@ -49,9 +140,9 @@ class ExtractionNode(BaseNode):
             )
         super().__init__(config, **kwargs)
         
-        # Entity extraction prompt
-        self.extraction_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert information extraction specialist. Extract the following from the provided text:
+        # Entity extraction instructions, shared by the single-text and
+        # batched section prompts
+        extraction_instructions = """You are an expert information extraction specialist. Extract the following from the provided text:
 
             1. ENTITIES: Identify all named entities with their types:
                - People (PERSON): Full names, titles, roles
@@ -71,12 +162,33 @@ class ExtractionNode(BaseNode):
             4. RELATIONSHIPS: Note important relationships between entities
                (e.g., "John Smith" -> "works for" -> "Acme Corp")
             
-            Provide your confidence level (0-1) in the extraction quality."""),
+            Provide your confidence level (0-1) in the extraction quality."""
+        
+        # Entity extraction prompt
+        self.extraction_prompt = ChatPromptTemplate.from_messages([
+            ("system", extraction_instructions),
             ("human", "Text to analyze:\n\n{content}\n\nExtract entities, facts, themes, and relationships.")
         ])
         
         self.extraction_parser = PydanticOutputParser(pydantic_object=ExtractionResult)
         
+        self.batch_extraction_parser = PydanticOutputParser(pydantic_object=BatchExtractionResult)
+        
+        # Batched prompt: all sections of a document in one call. The system
+        # message stays the same for every document (the per-document section
+        # count goes in the human message) so it can be cached as a prefix.
+        self.batch_extraction_prompt = ChatPromptTemplate.from_messages([
+            ("system", extraction_instructions + """
+            
+            The text is split into sections, each delimited by
+            <<<SECTION i title=...>>> and <<<END i>>>. Extract from each section
+            separately and return one result per section in "sections", in
+            section order.
+            
+            {format_instructions}"""),
+            ("human", "Sections to analyze ({section_count} in total):\n\n{content}\n\nExtract entities, facts, themes, and relationships for each of the {section_count} sections.")
+        ]).partial(format_instructions=self.batch_extraction_parser.get_format_instructions())
+        
         # Entity type mapping
         self.entity_types = {
             "PERSON": ["person", "people", "individual", "human"],
@@ -115,19 +227,21 @@ class ExtractionNode(BaseNode):
         content = state["processed_content"]
         sections = self.get_context(state, "document_sections", [])
         
-        # Process each section if available, otherwise process full content
-        if sections and self.llm:
-            # Extract from each section and aggregate
+        # Process each section if available, otherwise process full content.
+        # Content that fits one call's budget is sent whole: splitting it
+        # would only add per-section overhead.
+        if sections and self.llm and self.count_tokens(content) > EXTRACTION_MAX_TOKENS:
+            # Extract from the sections and aggregate
             all_entities = []
             all_facts = []
             all_themes = []
             
-            for section in sections[:5]:  # Limit to first 5 sections for performance
-                section_result = await self._extract_from_section(
-                    section["content"],
-                    section["title"]
-                )
-                
+            # Limit to the first few sections for performance
+            section_results = await self._extract_from_sections(
+                sections[:MAX_BATCHED_SECTIONS]
+            )
+            
+            for section_result in section_results:
                 # Aggregate results
                 all_entities.extend(section_result["entities"])
                 all_facts.extend(section_result["facts"])
@@ -148,7 +262,7 @@ class ExtractionNode(BaseNode):
                 state["confidence_scores"].extraction = extraction_result.confidence
             else:
                 # Fallback to basic extraction
-                entities = self._extract_entities_basic(content)
+                entities = await self._extract_entities_basic(content)
                 facts = self._extract_facts_basic(content)
                 themes = self._extract_themes_basic(content)
                 state["confidence_scores"].extraction = 0.6
@@ -186,6 +300,66 @@ class ExtractionNode(BaseNode):
         
         return state
     
+    async def _extract_from_sections(
+        self,
+        sections: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract information from several sections with a single LLM call.
+        
+        The instructions and output schema are sent once for all sections
+        instead of once per section. If the batched response can't be used
+        (call or parse failure, wrong number of results), each section is
+        extracted with its own call instead, all issued concurrently.
+        """
+        # Each section gets the single-call budget
+        sections = [
+            {**section, "content": self.truncate_to_tokens(section["content"], EXTRACTION_MAX_TOKENS)}
+            for section in sections
+        ]
+        
+        joined = "\n\n".join(
+            f"<<<SECTION {i} title={section['title']}>>>\n{section['content']}\n<<<END {i}>>>"
+            for i, section in enumerate(sections, 1)
+        )
+        
+        try:
+            result = await self.invoke_llm_chain(
+                self.batch_extraction_prompt,
+                {"content": joined, "section_count": len(sections)},
+                self.batch_extraction_parser
+            )
+        except Exception as e:
+            self.logger.warning(f"Batched section extraction failed, extracting per section: {e}")
+            result = None
+        
+        if result is None or len(result.sections) != len(sections):
+            if result is not None:
+                self.logger.warning(
+                    f"Batched extraction returned {len(result.sections)} results "
+                    f"for {len(sections)} sections, extracting per section"
+                )
+            # Sections are independent and _extract_from_section never
+            # raises, so the calls can simply run side by side
+            return await asyncio.gather(*(
+                self._extract_from_section(section["content"], section["title"])
+                for section in sections
+            ))
+        
+        # Add section context to entities (copies: result may be a cached
+        # response shared with other calls)
+        return [
+            {
+                "entities": [
+                    {**entity, "section": section["title"]}
+                    for entity in section_result.entities
+                ],
+                "facts": section_result.facts,
+                "themes": section_result.themes
+            }
+            for section, section_result in zip(sections, result.sections)
+        ]
+    
     async def _extract_from_section(
         self,
         content: str,
@@ -193,19 +367,19 @@ class ExtractionNode(BaseNode):
     ) -> Dict[str, Any]:
         """Extract information from a single section"""
         try:
-            chain = await self.create_llm_chain(
+            result = await self.invoke_llm_chain(
                 self.extraction_prompt,
+                {"content": content},
                 self.extraction_parser
             )
             
-            result = await chain.ainvoke({"content": content})
-            
-            # Add section context to entities
-            for entity in result.entities:
-                entity["section"] = section_title
-            
+            # Add section context to entities (copies: result may be a
+            # cached response shared with other calls)
             return {
-                "entities": result.entities,
+                "entities": [
+                    {**entity, "section": section_title}
+                    for entity in result.entities
+                ],
                 "facts": result.facts,
                 "themes": result.themes
             }
@@ -217,32 +391,26 @@ class ExtractionNode(BaseNode):
     async def _extract_with_llm(self, content: str) -> ExtractionResult:
         """Extract information using LLM"""
         # Truncate content if too long
-        max_length = 4000
-        if len(content) > max_length:
-            content = content[:max_length] + "..."
+        content = self.truncate_to_tokens(content, EXTRACTION_MAX_TOKENS)
         
-        chain = await self.create_llm_chain(
+        return await self.invoke_llm_chain(
             self.extraction_prompt,
+            {"content": content},
             self.extraction_parser
         )
-        
-        return await chain.ainvoke({"content": content})
     
-    def _extract_entities_basic(self, content: str) -> List[Dict[str, Any]]:
+    async def _extract_entities_basic(self, content: str) -> List[Dict[str, Any]]:
         """Basic entity extraction without LLM"""
-        entities = []
+        # Loading the model and running NER are CPU-bound, so keep them off
+        # the event loop that other documents are running on
+        nlp = await asyncio.to_thread(_load_spacy_pipeline)
+        if nlp is not None:
+            return await asyncio.to_thread(self._extract_entities_spacy, nlp, content)
         
-        # Simple patterns for common entity types
-        patterns = {
-            "PERSON": r'\b[A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?\b',
-            "ORG": r'\b[A-Z][A-Za-z]+(?:\s[A-Z][A-Za-z]+)*(?:\sInc\.?|\sCorp\.?|\sLLC|\sLtd\.?)\b',
-            "LOC": r'\b(?:New York|London|Paris|Tokyo|[A-Z][a-z]+(?:,\s*[A-Z]{2})?)\b',
-            "TIME": r'\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}|January|February|March|April|May|June|July|August|September|October|November|December)\b'
-        }
+        entities = []
         
-        for entity_type, pattern in patterns.items():
-            matches = re.finditer(pattern, content)
-            for match in matches:
+        for entity_type, pattern in _ENTITY_PATTERNS.items():
+            for match in pattern.finditer(content):
                 entities.append({
                     "type": entity_type,
                     "name": match.group(),
@@ -251,33 +419,63 @@ class ExtractionNode(BaseNode):
         
         return entities
     
+    def _extract_entities_spacy(self, nlp: Any, content: str) -> List[Dict[str, Any]]:
+        """Entity extraction with spaCy's statistical NER"""
+        # The pipeline is shared, so documents longer than its length limit
+        # are split into chunks (at whitespace, so no entity is cut in two)
+        # instead of raising the limit for everyone
+        offsets = []
+        start = 0
+        while start < len(content):
+            end = min(start + nlp.max_length, len(content))
+            if end < len(content):
+                split = content.rfind(" ", start, end)
+                if split > start:
+                    end = split
+            offsets.append((start, end))
+            start = end
+        
+        entities = []
+        chunks = nlp.pipe(content[begin:stop] for begin, stop in offsets)
+        for (offset, _), doc in zip(offsets, chunks):
+            for ent in doc.ents:
+                if ent.label_ not in _SPACY_LABELS:
+                    continue
+                start_char = offset + ent.start_char
+                end_char = offset + ent.end_char
+                entities.append({
+                    "type": _SPACY_LABELS[ent.label_],
+                    "name": ent.text,
+                    "context": content[max(0, start_char-50):end_char+50]
+                })
+        
+        return entities
+    
     def _extract_facts_basic(self, content: str) -> List[str]:
         """Basic fact extraction without LLM"""
         facts = []
         
-        # Look for sentences with fact indicators
-        sentences = content.split('.')
-        fact_indicators = ['reported', 'announced', 'discovered', 'found', 'revealed', 'stated']
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if any(indicator in sentence.lower() for indicator in fact_indicators):
-                if len(sentence) > 20 and len(sentence) < 200:
-                    facts.append(sentence + '.')
+        # Only sentences with fact indicators ever reach Python
+        for match in _FACT_SENTENCE_RE.finditer(content):
+            sentence = match.group().strip()
+            if 20 < len(sentence) < 200:
+                facts.append(sentence + '.')
+                if len(facts) == MAX_BASIC_FACTS:
+                    break
         
-        return facts[:10]  # Limit to top 10 facts
+        return facts
     
     def _extract_themes_basic(self, content: str) -> List[str]:
         """Basic theme extraction without LLM"""
-        # Simple word frequency analysis
-        words = re.findall(r'\b[a-z]+\b', content.lower())
-        
-        # Filter common words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were'}
-        words = [w for w in words if w not in stop_words and len(w) > 4]
+        # Simple word frequency analysis, counted straight off the scanner
+        # without materializing word lists (common words filtered out)
+        word_freq = Counter(
+            word
+            for word in map(re.Match.group, _WORD_RE.finditer(content.lower()))
+            if len(word) > 4 and word not in _STOP_WORDS
+        )
         
         # Get most common words as themes
-        word_freq = Counter(words)
         themes = [word for word, _ in word_freq.most_common(5)]
         
         return themes
@@ -288,12 +486,15 @@ class ExtractionNode(BaseNode):
         full_content: str
     ) -> ExtractedEntity:
         """Create ExtractedEntity object from raw entity data"""
+        get = entity_data.get
+        
         # Normalize entity type
-        entity_type = entity_data.get("type", "UNKNOWN").upper()
+        raw_type = get("type", "UNKNOWN")
+        entity_type = _ENTITY_TYPE_NAMES.get(raw_type) or raw_type.upper()
         
         # Find better context if needed
-        name = entity_data.get("name", "")
-        context = entity_data.get("context", "")
+        name = get("name", "")
+        context = get("context", "")
         
         if not context and name:
             # Find entity in content
@@ -307,36 +508,30 @@ class ExtractionNode(BaseNode):
             entity_type=entity_type,
             name=name,
             context=context,
-            confidence=entity_data.get("confidence", 0.7),
+            confidence=get("confidence", 0.7),
             metadata=entity_data
         )
     
     def _deduplicate_entities(self, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate entities"""
-        seen = set()
-        unique_entities = []
-        
+        # First occurrence of each (type, name) wins; dicts keep insertion order
+        unique_entities: Dict[tuple, Dict[str, Any]] = {}
         for entity in entities:
-            key = (entity.get("type", ""), entity.get("name", "").lower())
-            if key not in seen:
-                seen.add(key)
-                unique_entities.append(entity)
+            unique_entities.setdefault(
+                (entity.get("type", ""), entity.get("name", "").lower()),
+                entity
+            )
         
-        return unique_entities
+        return list(unique_entities.values())
     
     def _deduplicate_facts(self, facts: List[str]) -> List[str]:
         """Remove duplicate or similar facts"""
-        unique_facts = []
-        seen_facts = set()
-        
+        # Simple similarity check (could be enhanced); first occurrence wins
+        unique_facts: Dict[str, str] = {}
         for fact in facts:
-            # Simple similarity check (could be enhanced)
-            fact_lower = fact.lower().strip()
-            if fact_lower not in seen_facts:
-                seen_facts.add(fact_lower)
-                unique_facts.append(fact)
+            unique_facts.setdefault(fact.lower().strip(), fact)
         
-        return unique_facts
+        return list(unique_facts.values())
     
     def _identify_top_themes(self, all_themes: List[str]) -> List[str]:
         """Identify top themes from all extracted themes"""
@@ -14,7 +14,61 @@ from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 
 from .base_node import BaseNode, NodeConfig
-from ..state.agent_state import AgentState, ProcessingStage
+from ..state.agent_state import AgentState, ProcessingStage, add_error_message
+
+
+# Typographic quotes -> ASCII quotes
+_QUOTE_TABLE = str.maketrans({
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2018': "'",
+    '\u2019': "'",
+})
+
+# One pass for both cleanup steps: group 1 is a whitespace run (collapsed
+# to a single space), anything else matched is a special character (dropped)
+_WHITESPACE_OR_SPECIAL_RE = re.compile(r'(\s+)|[^\w\s\-.,!?;:()\'"]+')
+
+# Common OCR errors: letters split by spaces ("l l", "i n", "t h e",
+# "a n d"); the fix is the match with its whitespace removed
+_SPACED_LETTERS_RE = re.compile(r'\b(?:l\s+l|i\s+n|t\s+h\s+e|a\s+n\s+d)\b')
+_SPACE_RE = re.compile(r'\s+')
+
+# Cheap pre-check for the OCR fixes: two single letters separated by
+# whitespace, which every _SPACED_LETTERS_RE match starts with. Dropping
+# special characters can leave several spaces between them ("i • n").
+_OCR_HEURISTIC = re.compile(r'\b[a-z]\s+[a-z]\b')
+
+# Lowercase-to-uppercase boundary ("wordsRunTogether")
+_CAMEL_CASE_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+
+def _collapse_or_drop(match: re.Match) -> str:
+    """Replacement for _WHITESPACE_OR_SPECIAL_RE matches"""
+    return ' ' if match.group(1) else ''
+
+
+def _join_spaced_letters(match: re.Match) -> str:
+    """Replacement for _SPACED_LETTERS_RE matches"""
+    return _SPACE_RE.sub('', match.group())
+
+# Token budget for the document text sent to the analysis LLM call
+ANALYSIS_MAX_TOKENS = 750
+
+# Document type indicators, checked in order (applied to lowercased content)
+_DOCUMENT_TYPE_PATTERNS = [
+    (re.compile(r'(interview|q\s*:\s*|a\s*:\s*)'), "interview"),
+    (re.compile(r'(chapter|section\s+\d+|table of contents)'), "book"),
+    (re.compile(r'(abstract|methodology|conclusion|references)'), "research_paper"),
+    (re.compile(r'(dear|sincerely|regards)'), "letter"),
+    (re.compile(r'(executive summary|findings|recommendations)'), "report"),
+]
+
+# Paragraphs grouped into one section when a document has no headers
+PARAGRAPHS_PER_SECTION = 5
+
+# All-caps line treated as a section header
+_SECTION_HEADER_RE = re.compile(r'\n\s*([A-Z][A-Z\s]+)\s*\n')
 
 
 class DocumentAnalysis(BaseModel):
@@ -38,7 +92,22 @@ class IngestionNode(BaseNode):
     - Prepare content for entity extraction
     """
     
-    def __init__(self, config: Optional[NodeConfig] = None, **kwargs):
+    # Document analysis is idempotent: re-ingesting the same content reuses
+    # the earlier result (see BaseNode.invoke_llm_chain)
+    cache_sampled_responses = True
+    
+    # Insert a space at camelCase boundaries while cleaning, for extracted
+    # text whose line breaks were lost. Disable for clean input, where the
+    # split is an extra full-text pass that also breaks names like "iPhone"
+    # (see WorkflowConfig.split_camel_case)
+    split_camel_case = True
+    
+    def __init__(
+        self,
+        config: Optional[NodeConfig] = None,
+        split_camel_case: Optional[bool] = None,
+        **kwargs
+    ):
         """Initialize ingestion node with default config if not provided"""
         if not config:
             config = NodeConfig(
@@ -50,6 +119,9 @@ class IngestionNode(BaseNode):
             )
         super().__init__(config, **kwargs)
         
+        if split_camel_case is not None:
+            self.split_camel_case = split_camel_case
+        
         # Analysis prompt template
         self.analysis_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a document analysis expert. Analyze the provided document and extract:
@@ -117,7 +189,8 @@ class IngestionNode(BaseNode):
             
             # Log quality assessment
             if analysis.quality_score < 0.5:
-                state["error_messages"].append(
+                add_error_message(
+                    state,
                     f"Low document quality detected: {analysis.quality_score:.2f}"
                 )
         else:
@@ -126,9 +199,14 @@ class IngestionNode(BaseNode):
             state["metadata"].language = "en"  # Default to English
             state["confidence_scores"].overall = 0.7
         
-        # Prepare sections for extraction
-        sections = self._segment_document(cleaned_content)
-        self.add_context(state, "document_sections", sections)
+        # Prepare sections for extraction. Cleaning collapses the line
+        # breaks that headers and paragraphs are found by, so segment the
+        # raw content and clean each section. Stored under the shared
+        # (un-namespaced) key, since ExtractionNode is the reader.
+        sections = self._segment_document(state["raw_content"])
+        for section in sections:
+            section["content"] = self._clean_text(section["content"])
+        state["agent_context"]["document_sections"] = sections
         
         # Update stage for next node
         self.update_stage(state, ProcessingStage.EXTRACTION)
@@ -154,18 +232,21 @@ class IngestionNode(BaseNode):
         Returns:
             Cleaned text
         """
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Normalize quotes (before special characters are stripped, which
+        # would otherwise delete typographic quotes outright)
+        text = text.translate(_QUOTE_TABLE)
         
-        # Remove special Unicode characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\-.,!?;:()\'"]+', '', text)
+        # Remove excessive whitespace and special Unicode characters, but
+        # keep basic punctuation
+        text = _WHITESPACE_OR_SPECIAL_RE.sub(_collapse_or_drop, text)
         
-        # Fix common OCR errors
-        text = self._fix_common_ocr_errors(text)
+        # Fix common OCR errors (skipped for text with no spaced letters)
+        if _OCR_HEURISTIC.search(text):
+            text = self._fix_common_ocr_errors(text)
         
-        # Normalize quotes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
+        # Separate words run together across lost line breaks
+        if self.split_camel_case:
+            text = _CAMEL_CASE_RE.sub(' ', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
@@ -174,18 +255,7 @@ class IngestionNode(BaseNode):
     
     def _fix_common_ocr_errors(self, text: str) -> str:
         """Fix common OCR errors in text"""
-        replacements = {
-            r'\bl\s+l\b': 'll',  # l l -> ll
-            r'\bi\s+n\b': 'in',   # i n -> in
-            r'\bt\s+h\s+e\b': 'the',  # t h e -> the
-            r'\ba\s+n\s+d\b': 'and',  # a n d -> and
-            r'(?<=[a-z])(?=[A-Z])': ' ',  # Add space between camelCase
-        }
-        
-        for pattern, replacement in replacements.items():
-            text = re.sub(pattern, replacement, text)
-        
-        return text
+        return _SPACED_LETTERS_RE.sub(_join_spaced_letters, text)
     
     def _detect_document_type(self, content: str) -> str:
         """
@@ -200,18 +270,11 @@ class IngestionNode(BaseNode):
         content_lower = content.lower()
         
         # Check for common document type indicators
-        if re.search(r'(interview|q\s*:\s*|a\s*:\s*)', content_lower):
-            return "interview"
-        elif re.search(r'(chapter|section\s+\d+|table of contents)', content_lower):
-            return "book"
-        elif re.search(r'(abstract|methodology|conclusion|references)', content_lower):
-            return "research_paper"
-        elif re.search(r'(dear|sincerely|regards)', content_lower):
-            return "letter"
-        elif re.search(r'(executive summary|findings|recommendations)', content_lower):
-            return "report"
-        else:
-            return "article"
+        for pattern, document_type in _DOCUMENT_TYPE_PATTERNS:
+            if pattern.search(content_lower):
+                return document_type
+        
+        return "article"
     
     def _segment_document(self, content: str) -> List[Dict[str, str]]:
         """
@@ -226,8 +289,7 @@ class IngestionNode(BaseNode):
         sections = []
         
         # Try to identify section headers
-        header_pattern = r'\n\s*([A-Z][A-Z\s]+)\s*\n'
-        matches = list(re.finditer(header_pattern, content))
+        matches = list(_SECTION_HEADER_RE.finditer(content))
         
         if matches:
             # Document has clear sections
@@ -242,17 +304,16 @@ class IngestionNode(BaseNode):
                 }
                 sections.append(section)
         else:
-            # No clear sections, split by paragraphs
-            paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+            # No clear sections, split by paragraphs (each stripped once)
+            paragraphs = [p for p in map(str.strip, content.split('\n\n')) if p]
             
             # Group into logical sections (e.g., 5 paragraphs per section)
-            for i in range(0, len(paragraphs), 5):
-                section = {
-                    "title": f"Section {i // 5 + 1}",
-                    "content": '\n\n'.join(paragraphs[i:i+5]),
-                    "position": i // 5
-                }
-                sections.append(section)
+            for position, i in enumerate(range(0, len(paragraphs), PARAGRAPHS_PER_SECTION)):
+                sections.append({
+                    "title": f"Section {position + 1}",
+                    "content": '\n\n'.join(paragraphs[i:i + PARAGRAPHS_PER_SECTION]),
+                    "position": position
+                })
         
         return sections
     
@@ -267,18 +328,13 @@ class IngestionNode(BaseNode):
             Document analysis results
         """
         # Truncate content if too long (keep first and last parts)
-        max_length = 3000
-        if len(content) > max_length:
-            truncated = content[:max_length//2] + "\n...\n" + content[-max_length//2:]
-        else:
-            truncated = content
+        truncated = self.truncate_to_tokens(content, ANALYSIS_MAX_TOKENS, keep_tail=True)
         
         # Create and run chain
-        chain = await self.create_llm_chain(
+        analysis = await self.invoke_llm_chain(
             self.analysis_prompt,
+            {"content": truncated},
             self.analysis_parser
         )
         
-        analysis = await chain.ainvoke({"content": truncated})
-        
         return analysis
\ No newline at end of file
@@ -36,6 +36,51 @@ class GeneratedStory(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0, description="Generation confidence")
 
 
+# Document type -> narrative type (other document types use "transformation")
+_NARRATIVE_TYPES = {
+    "report": "investigation",
+    "interview": "biography",
+    "article": "discovery",
+    "research_paper": "discovery",
+    "letter": "conflict"
+}
+
+# Story generation prompt and parser. Built once per process and shared by
+# every node instance, which also lets instances share cached chains (see
+# BaseNode.create_llm_chain)
+_STORY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a master storyteller and narrative architect. Transform the provided entities, facts, and themes into a compelling narrative.
+
+    Guidelines:
+    1. ACCURACY: Stay true to the facts while crafting an engaging narrative
+    2. STRUCTURE: Create a clear narrative arc with beginning, middle, and end
+    3. CHARACTERS: Develop the entities into compelling characters with motivations
+    4. CONFLICT: Identify and highlight tensions, conflicts, or challenges
+    5. THEMES: Weave the identified themes throughout the narrative
+    6. TONE: Match the tone to the content (investigative for scandals, inspiring for achievements, etc.)
+    
+    Create a narrative that:
+    - Engages readers from the first sentence
+    - Maintains factual accuracy
+    - Provides context and background
+    - Builds tension and resolution
+    - Concludes with impact
+    
+    Also provide the narrative structure and individual story elements."""),
+    ("human", """Entities: {entities}
+    
+    Facts: {facts}
+    
+    Themes: {themes}
+    
+    Document Context: {context}
+    
+    Generate a compelling narrative from this information.""")
+])
+
+_STORY_PARSER = PydanticOutputParser(pydantic_object=GeneratedStory)
+
+
 class StoryGenerationNode(BaseNode):
     """
     Node responsible for generating stories and narratives from extracted information.
@@ -60,38 +105,9 @@ class StoryGenerationNode(BaseNode):
             )
         super().__init__(config, **kwargs)
         
-        # Story generation prompt
-        self.story_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a master storyteller and narrative architect. Transform the provided entities, facts, and themes into a compelling narrative.
-
-            Guidelines:
-            1. ACCURACY: Stay true to the facts while crafting an engaging narrative
-            2. STRUCTURE: Create a clear narrative arc with beginning, middle, and end
-            3. CHARACTERS: Develop the entities into compelling characters with motivations
-            4. CONFLICT: Identify and highlight tensions, conflicts, or challenges
-            5. THEMES: Weave the identified themes throughout the narrative
-            6. TONE: Match the tone to the content (investigative for scandals, inspiring for achievements, etc.)
-            
-            Create a narrative that:
-            - Engages readers from the first sentence
-            - Maintains factual accuracy
-            - Provides context and background
-            - Builds tension and resolution
-            - Concludes with impact
-            
-            Also provide the narrative structure and individual story elements."""),
-            ("human", """Entities: {entities}
-            
-            Facts: {facts}
-            
-            Themes: {themes}
-            
-            Document Context: {context}
-            
-            Generate a compelling narrative from this information.""")
-        ])
-        
-        self.story_parser = PydanticOutputParser(pydantic_object=GeneratedStory)
+        # Shared module-level prompt and parser
+        self.story_prompt = _STORY_PROMPT
+        self.story_parser = _STORY_PARSER
         
         # Narrative templates for different story types
         self.narrative_templates = {
@@ -134,6 +150,7 @@ class StoryGenerationNode(BaseNode):
         # Get document context
         doc_summary = self.get_context(state, "document_summary", "")
         doc_type = state["metadata"].document_type
+        scores = state["confidence_scores"]
         
         if self.llm:
             # Generate story using LLM
@@ -141,12 +158,11 @@ class StoryGenerationNode(BaseNode):
                 entities, facts, themes, doc_summary
             )
             
-            # Store generated narrative
-            state["generated_narrative"] = story_result.narrative
-            state["narrative_structure"] = story_result.structure.dict()
+            narrative = story_result.narrative
+            state["narrative_structure"] = story_result.structure.model_dump()
             
             # Convert story elements to StoryElement objects
-            state["story_elements"] = [
+            story_elements = [
                 StoryElement(
                     element_type=elem.get("type", "scene"),
                     content=elem.get("content", ""),
@@ -157,26 +173,29 @@ class StoryGenerationNode(BaseNode):
             ]
             
             # Update confidence
-            state["confidence_scores"].story_quality = story_result.confidence
+            scores.story_quality = story_result.confidence
             
         else:
             # Fallback to template-based generation
             narrative = self._generate_story_basic(entities, facts, themes, doc_type)
-            state["generated_narrative"] = narrative
             
             # Create basic story elements
-            state["story_elements"] = self._create_basic_story_elements(
+            story_elements = self._create_basic_story_elements(
                 entities, facts, themes
             )
             
-            state["confidence_scores"].story_quality = 0.6
+            scores.story_quality = 0.6
+        
+        # Store generated narrative and elements
+        state["generated_narrative"] = narrative
+        state["story_elements"] = story_elements
         
         # Update overall confidence
-        state["confidence_scores"].update_overall()
+        scores.update_overall()
         
         # Add generation metrics to context
-        self.add_context(state, "narrative_length", len(state["generated_narrative"]))
-        self.add_context(state, "story_elements_count", len(state["story_elements"]))
+        self.add_context(state, "narrative_length", len(narrative))
+        self.add_context(state, "story_elements_count", len(story_elements))
         
         # Update stage
         self.update_stage(state, ProcessingStage.VALIDATION)
@@ -184,9 +203,9 @@ class StoryGenerationNode(BaseNode):
         self.logger.info(
             f"Story generation complete for {state['document_id']}",
             extra={
-                "narrative_length": len(state["generated_narrative"]),
-                "elements": len(state["story_elements"]),
-                "confidence": state["confidence_scores"].story_quality
+                "narrative_length": len(narrative),
+                "elements": len(story_elements),
+                "confidence": scores.story_quality
             }
         )
         
@@ -209,20 +228,18 @@ class StoryGenerationNode(BaseNode):
         # Prepare fact information
         fact_info = [f["fact"] for f in facts[:15]]  # Limit to top 15 facts
         
-        # Create chain
-        chain = await self.create_llm_chain(
+        # Generate story
+        story = await self.invoke_llm_chain(
             self.story_prompt,
+            {
+                "entities": "\n".join(entity_info),
+                "facts": "\n".join(fact_info),
+                "themes": ", ".join(themes),
+                "context": context
+            },
             self.story_parser
         )
         
-        # Generate story
-        story = await chain.ainvoke({
-            "entities": "\n".join(entity_info),
-            "facts": "\n".join(fact_info),
-            "themes": ", ".join(themes),
-            "context": context
-        })
-        
         return story
     
     def _generate_story_basic(
@@ -283,15 +300,7 @@ class StoryGenerationNode(BaseNode):
     
     def _get_narrative_type(self, doc_type: str) -> str:
         """Get narrative type based on document type"""
-        narrative_map = {
-            "report": "investigation",
-            "interview": "biography",
-            "article": "discovery",
-            "research_paper": "discovery",
-            "letter": "conflict"
-        }
-        
-        narrative_type = narrative_map.get(doc_type, "transformation")
+        narrative_type = _NARRATIVE_TYPES.get(doc_type, "transformation")
         return self.narrative_templates.get(narrative_type, "compelling")
     
     def _create_basic_story_elements(
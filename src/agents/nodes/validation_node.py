@@ -5,7 +5,7 @@ This node validates generated content for quality, accuracy, and completeness,
 providing scoring and feedback for improvement.
 """
 
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 import re
 from datetime import datetime
 
@@ -31,6 +31,89 @@ class ValidationChecks(BaseModel):
     overall_confidence: float = Field(ge=0.0, le=1.0, description="Overall validation confidence")
 
 
+# Leading words of a fact checked against the narrative by basic validation
+FACT_KEYWORDS = 5
+
+# Narrative word counts below which basic validation reports an error /
+# a warning
+MIN_NARRATIVE_WORDS = 100
+BRIEF_NARRATIVE_WORDS = 200
+
+# Token budget for the narrative sent to the validation LLM call
+VALIDATION_MAX_TOKENS = 1250
+
+# Confidence in a basic-validation result. One settled outside the basic
+# validation band rises from this at the band's edge to 1.0 at a score of
+# 0.0 (clear failure) or 1.0 (clear pass)
+BASIC_VALIDATION_CONFIDENCE = 0.7
+
+# ValidationChecks aspects and their weights in the overall score
+_SCORE_WEIGHTS = (
+    ("factual_accuracy", 0.3),
+    ("narrative_coherence", 0.2),
+    ("completeness", 0.2),
+    ("clarity", 0.1),
+    ("entity_coverage", 0.1),
+    ("theme_integration", 0.1),
+)
+
+# Validation prompt and parser. Built once per process and shared by every
+# node instance, which also lets instances share cached chains (see
+# BaseNode.create_llm_chain)
+_VALIDATION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a meticulous content validator and quality assessor. Evaluate the generated narrative against the source information.
+
+    Perform these validation checks:
+    
+    1. FACTUAL ACCURACY (0-1):
+       - Are all facts in the narrative supported by the source data?
+       - Are entities correctly represented?
+       - Is chronology accurate?
+    
+    2. NARRATIVE COHERENCE (0-1):
+       - Does the story flow logically?
+       - Are transitions smooth?
+       - Is the narrative structure clear?
+    
+    3. COMPLETENESS (0-1):
+       - Are all key entities included?
+       - Are important facts covered?
+       - Are themes adequately explored?
+    
+    4. CLARITY (0-1):
+       - Is the language clear and accessible?
+       - Are complex ideas well-explained?
+       - Is the reading level appropriate?
+    
+    5. ENTITY COVERAGE (0-1):
+       - What percentage of entities are included?
+       - Are they properly contextualized?
+    
+    6. THEME INTEGRATION (0-1):
+       - Are themes woven throughout?
+       - Do they enhance the narrative?
+    
+    Identify:
+    - ERRORS: Factual inaccuracies, misrepresentations
+    - WARNINGS: Potential issues, unclear passages
+    - SUGGESTIONS: Specific improvements
+    
+    Provide an overall confidence score for the content quality."""),
+    ("human", """Source Entities: {entities}
+    
+    Source Facts: {facts}
+    
+    Themes: {themes}
+    
+    Generated Narrative:
+    {narrative}
+    
+    Validate this narrative against the source information.""")
+])
+
+_VALIDATION_PARSER = PydanticOutputParser(pydantic_object=ValidationChecks)
+
+
 class ValidationNode(BaseNode):
     """
     Node responsible for validating and scoring generated content.
@@ -43,7 +126,18 @@ class ValidationNode(BaseNode):
     - Generate final quality scores
     """
     
-    def __init__(self, config: Optional[NodeConfig] = None, **kwargs):
+    # (fail_below, pass_from): when set, the basic checks run before the LLM
+    # and a narrative scoring below fail_below, or at least pass_from with
+    # no errors, is settled on that result without the LLM call. None
+    # always validates with the LLM (see ValidationConfig.basic_fail_below)
+    basic_validation_band: Optional[Tuple[float, float]] = None
+    
+    def __init__(
+        self,
+        config: Optional[NodeConfig] = None,
+        basic_validation_band: Optional[Tuple[float, float]] = None,
+        **kwargs
+    ):
         """Initialize validation node with default config if not provided"""
         if not config:
             config = NodeConfig(
@@ -55,59 +149,12 @@ class ValidationNode(BaseNode):
             )
         super().__init__(config, **kwargs)
         
-        # Validation prompt
-        self.validation_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a meticulous content validator and quality assessor. Evaluate the generated narrative against the source information.
-
-            Perform these validation checks:
-            
-            1. FACTUAL ACCURACY (0-1):
-               - Are all facts in the narrative supported by the source data?
-               - Are entities correctly represented?
-               - Is chronology accurate?
-            
-            2. NARRATIVE COHERENCE (0-1):
-               - Does the story flow logically?
-               - Are transitions smooth?
-               - Is the narrative structure clear?
-            
-            3. COMPLETENESS (0-1):
-               - Are all key entities included?
-               - Are important facts covered?
-               - Are themes adequately explored?
-            
-            4. CLARITY (0-1):
-               - Is the language clear and accessible?
-               - Are complex ideas well-explained?
-               - Is the reading level appropriate?
-            
-            5. ENTITY COVERAGE (0-1):
-               - What percentage of entities are included?
-               - Are they properly contextualized?
-            
-            6. THEME INTEGRATION (0-1):
-               - Are themes woven throughout?
-               - Do they enhance the narrative?
-            
-            Identify:
-            - ERRORS: Factual inaccuracies, misrepresentations
-            - WARNINGS: Potential issues, unclear passages
-            - SUGGESTIONS: Specific improvements
-            
-            Provide an overall confidence score for the content quality."""),
-            ("human", """Source Entities: {entities}
-            
-            Source Facts: {facts}
-            
-            Themes: {themes}
-            
-            Generated Narrative:
-            {narrative}
-            
-            Validate this narrative against the source information.""")
-        ])
+        if basic_validation_band is not None:
+            self.basic_validation_band = basic_validation_band
         
-        self.validation_parser = PydanticOutputParser(pydantic_object=ValidationChecks)
+        # Shared module-level prompt and parser
+        self.validation_prompt = _VALIDATION_PROMPT
+        self.validation_parser = _VALIDATION_PARSER
         
         # Validation thresholds
         self.thresholds = {
@@ -145,7 +192,18 @@ class ValidationNode(BaseNode):
         facts = state["extracted_facts"]
         themes = state["key_themes"]
         
-        if self.llm:
+        # Clear passes and failures may be settled by the basic checks alone
+        validation_result = (
+            self._decisive_basic_result(narrative, entities, facts, themes)
+            if self.llm else None
+        )
+        
+        if validation_result is not None:
+            state["confidence_scores"].validation = self._settled_confidence(
+                validation_result.score
+            )
+            
+        elif self.llm:
             # Perform LLM-based validation
             validation_checks = await self._validate_with_llm(
                 narrative, entities, facts, themes
@@ -171,7 +229,7 @@ class ValidationNode(BaseNode):
             validation_result = self._validate_basic(
                 narrative, entities, facts, themes
             )
-            state["confidence_scores"].validation = 0.7
+            state["confidence_scores"].validation = BASIC_VALIDATION_CONFIDENCE
         
         # Store validation result
         state["validation_result"] = validation_result
@@ -226,22 +284,74 @@ class ValidationNode(BaseNode):
         # Prepare fact information
         fact_info = [f["fact"] for f in facts[:20]]
         
-        # Create chain
-        chain = await self.create_llm_chain(
+        # Validate
+        validation = await self.invoke_llm_chain(
             self.validation_prompt,
+            {
+                "entities": "\n".join(entity_info),
+                "facts": "\n".join(fact_info),
+                "themes": ", ".join(themes),
+                "narrative": self.truncate_to_tokens(narrative, VALIDATION_MAX_TOKENS)
+            },
             self.validation_parser
         )
         
-        # Validate
-        validation = await chain.ainvoke({
-            "entities": "\n".join(entity_info),
-            "facts": "\n".join(fact_info),
-            "themes": ", ".join(themes),
-            "narrative": narrative[:5000]  # Limit narrative length
-        })
-        
         return validation
     
+    def _decisive_basic_result(
+        self,
+        narrative: str,
+        entities: List[Any],
+        facts: List[Dict[str, Any]],
+        themes: List[str]
+    ) -> Optional[ValidationResult]:
+        """
+        Basic validation result, if it is clear enough to skip the LLM.
+        
+        Args:
+            narrative: Generated narrative
+            entities: Extracted entities
+            facts: Extracted facts
+            themes: Key themes
+            
+        Returns:
+            The basic result if its score falls outside basic_validation_band,
+            otherwise None (also when no band is configured)
+        """
+        if self.basic_validation_band is None:
+            return None
+        
+        result = self._validate_basic(narrative, entities, facts, themes)
+        fail_below, pass_from = self.basic_validation_band
+        
+        if result.score < fail_below or (result.score >= pass_from and not result.errors):
+            return result
+        return None
+    
+    def _settled_confidence(self, score: float) -> float:
+        """
+        Confidence in a basic result settled outside basic_validation_band.
+        
+        The further the score lies outside the band, the less an LLM check
+        could have changed the outcome.
+        
+        Args:
+            score: Basic validation score (outside the band)
+            
+        Returns:
+            Confidence between BASIC_VALIDATION_CONFIDENCE and 1.0
+        """
+        fail_below, pass_from = self.basic_validation_band
+        
+        if score < fail_below:
+            margin = (fail_below - score) / fail_below
+        elif pass_from < 1.0:
+            margin = (score - pass_from) / (1.0 - pass_from)
+        else:
+            margin = 1.0
+        
+        return BASIC_VALIDATION_CONFIDENCE + (1.0 - BASIC_VALIDATION_CONFIDENCE) * min(margin, 1.0)
+    
     def _validate_basic(
         self,
         narrative: str,
@@ -269,10 +379,14 @@ class ValidationNode(BaseNode):
             warnings.append(f"Low entity coverage: {entity_coverage:.1%}")
             suggestions.append("Include more entities from the source material")
         
-        # Check fact coverage
+        # Check fact coverage (a fact counts if any of its first few words
+        # appears; maxsplit stops splitting past them)
         covered_facts = sum(
             1 for fact_dict in facts
-            if any(word in narrative_lower for word in fact_dict["fact"].lower().split()[:5])
+            if any(
+                word in narrative_lower
+                for word in fact_dict["fact"].lower().split(None, FACT_KEYWORDS)[:FACT_KEYWORDS]
+            )
         )
         
         fact_coverage = covered_facts / len(facts) if facts else 0
@@ -281,11 +395,12 @@ class ValidationNode(BaseNode):
             warnings.append(f"Low fact coverage: {fact_coverage:.1%}")
             suggestions.append("Incorporate more facts from the source")
         
-        # Check narrative length
-        word_count = len(narrative.split())
-        if word_count < 100:
+        # Check narrative length (only compared against the thresholds, so
+        # splitting stops once the longer one is reached)
+        word_count = len(narrative.split(None, BRIEF_NARRATIVE_WORDS))
+        if word_count < MIN_NARRATIVE_WORDS:
             errors.append("Narrative too short (less than 100 words)")
-        elif word_count < 200:
+        elif word_count < BRIEF_NARRATIVE_WORDS:
             warnings.append("Narrative may be too brief")
         
         # Check theme integration
@@ -318,18 +433,9 @@ class ValidationNode(BaseNode):
     def _calculate_overall_score(self, checks: ValidationChecks) -> float:
         """Calculate overall validation score from individual checks"""
         # Weighted average of different aspects
-        weights = {
-            "factual_accuracy": 0.3,
-            "narrative_coherence": 0.2,
-            "completeness": 0.2,
-            "clarity": 0.1,
-            "entity_coverage": 0.1,
-            "theme_integration": 0.1
-        }
-        
         score = sum(
             getattr(checks, aspect) * weight
-            for aspect, weight in weights.items()
+            for aspect, weight in _SCORE_WEIGHTS
         )
         
         # Penalize for errors and warnings
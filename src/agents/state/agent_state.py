@@ -12,6 +12,13 @@ from pydantic import BaseModel, Field
 from enum import Enum
 
 
+# Most recent error messages kept per document (see add_error_message).
+# Older messages are dropped once this many have been recorded, so memory
+# stays bounded across retries; the router clamps its "max_errors" limit
+# below this so the limit can still be exceeded.
+MAX_ERROR_MESSAGES = 32
+
+
 class ProcessingStage(str, Enum):
     """Enum representing the current stage of document processing"""
     INGESTION = "ingestion"
@@ -34,6 +41,23 @@ class ConfidenceScore(BaseModel):
         scores = [s for s in [self.extraction, self.story_quality, self.validation] if s is not None]
         if scores:
             self.overall = sum(scores) / len(scores)
+    
+    def __str__(self) -> str:
+        """
+        Compact one-line summary for log messages.
+        
+        Loggers receive the score object as a lazy %s argument, so this
+        only runs when a record is actually emitted.
+        """
+        parts = [f"overall={self.overall:.2f}"]
+        for label, value in (
+            ("extraction", self.extraction),
+            ("story_quality", self.story_quality),
+            ("validation", self.validation)
+        ):
+            if value is not None:
+                parts.append(f"{label}={value:.2f}")
+        return " ".join(parts)
 
 
 class DocumentMetadata(BaseModel):
@@ -90,7 +114,8 @@ class AgentState(TypedDict):
     # Processing metadata
     current_stage: ProcessingStage
     processing_history: List[Dict[str, Any]]
-    error_messages: List[str]
+    error_messages: List[str]  # bounded to MAX_ERROR_MESSAGES
+    error_count: int  # all errors recorded, including trimmed messages
     
     # Document metadata
     metadata: DocumentMetadata
@@ -153,6 +178,7 @@ def create_initial_state(
         current_stage=ProcessingStage.INGESTION,
         processing_history=[],
         error_messages=[],
+        error_count=0,
         metadata=metadata,
         extracted_entities=[],
         extracted_facts=[],
@@ -194,18 +220,43 @@ def add_processing_event(
     state["processing_history"].append(event)
 
 
-def should_continue_processing(state: AgentState) -> bool:
+def add_error_message(state: AgentState, message: str) -> None:
+    """
+    Record an error message, keeping only the most recent MAX_ERROR_MESSAGES.
+    
+    error_count keeps counting every error, so limits on the number of
+    errors still apply once older messages have been dropped.
+    
+    Args:
+        state: Current agent state
+        message: Error message
+    """
+    state["error_count"] = state.get("error_count", len(state["error_messages"])) + 1
+    error_messages = state["error_messages"]
+    error_messages.append(message)
+    if len(error_messages) > MAX_ERROR_MESSAGES:
+        del error_messages[:-MAX_ERROR_MESSAGES]
+
+
+def should_continue_processing(
+    state: AgentState,
+    min_confidence: Optional[float] = None
+) -> bool:
     """
     Determine if processing should continue based on current state.
     
     Args:
         state: Current agent state
+        min_confidence: Confidence threshold to apply. When None it is read
+            from agent_context (defaulting to 0.3).
         
     Returns:
         True if processing should continue, False otherwise
     """
-    # Check if we've reached a terminal stage
-    if state["current_stage"] in [ProcessingStage.COMPLETED, ProcessingStage.FAILED]:
+    # Check if we've reached a terminal stage (enum members are singletons,
+    # so identity checks avoid building and scanning a list on every call)
+    current_stage = state["current_stage"]
+    if current_stage is ProcessingStage.COMPLETED or current_stage is ProcessingStage.FAILED:
         return False
     
     # Check if we've exceeded retry limit
@@ -213,7 +264,8 @@ def should_continue_processing(state: AgentState) -> bool:
         return False
     
     # Check confidence threshold (configurable)
-    min_confidence = state["agent_context"].get("min_confidence_threshold", 0.3)
+    if min_confidence is None:
+        min_confidence = state["agent_context"].get("min_confidence_threshold", 0.3)
     if state["confidence_scores"].overall < min_confidence and state["retry_count"] > 0:
         return False
     
@@ -0,0 +1,147 @@
+"""
+Shared fixtures for the agent workflow tests.
+
+ScriptedChatModel stands in for the real LLM: it recognises which node is
+calling from the system prompt, answers with a valid JSON response for that
+node, and records every call so tests can assert on call counts.
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from agents.nodes.base_node import BaseNode
+
+
+# Text of each node's system prompt that identifies the calling node. The
+# batched extraction prompt also contains the single-text instructions, so
+# it is checked first.
+_PROMPT_MARKERS = (
+    ("batch_extraction", "<<<SECTION i title=...>>>"),
+    ("analysis", "document analysis expert"),
+    ("extraction", "information extraction specialist"),
+    ("story", "master storyteller"),
+    ("validation", "content validator"),
+)
+
+# Validation aspects scored by ValidationChecks
+_VALIDATION_ASPECTS = (
+    "factual_accuracy",
+    "narrative_coherence",
+    "completeness",
+    "clarity",
+    "entity_coverage",
+    "theme_integration",
+)
+
+
+def extraction_response(name: str = "John Smith") -> Dict[str, Any]:
+    """ExtractionResult payload with one entity and one fact"""
+    return {
+        "entities": [{"type": "PERSON", "name": name}],
+        "facts": [f"{name} announced record profits"],
+        "themes": ["growth"],
+        "relationships": [],
+        "confidence": 0.8
+    }
+
+
+def validation_response(score: float) -> Dict[str, Any]:
+    """ValidationChecks payload scoring every aspect the same"""
+    response = {aspect: score for aspect in _VALIDATION_ASPECTS}
+    response["overall_confidence"] = 0.9
+    return response
+
+
+def _default_response(kind: str, human: str) -> Dict[str, Any]:
+    """Well-formed response for a node, based on what it asked for"""
+    if kind == "analysis":
+        return {
+            "document_type": "report",
+            "language": "en",
+            "summary": "A report.",
+            "key_sections": ["Overview"],
+            "quality_score": 0.9,
+            "confidence": 0.9
+        }
+    if kind == "batch_extraction":
+        count = int(human.split("(", 1)[1].split(" ", 1)[0])
+        return {"sections": [extraction_response(f"Person {i}") for i in range(count)]}
+    if kind == "extraction":
+        return extraction_response()
+    if kind == "story":
+        return {
+            "title": "A Story",
+            "narrative": "John Smith announced record profits. " * 40,
+            "structure": {
+                "narrative_type": "investigation",
+                "main_characters": ["John Smith"],
+                "central_conflict": "growth",
+                "key_events": ["announcement"],
+                "themes": ["growth"],
+                "tone": "informative"
+            },
+            "story_elements": [{"type": "scene", "content": "announcement"}],
+            "confidence": 0.9
+        }
+    return validation_response(0.9)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model answering each node with a canned JSON response.
+    
+    responses maps a node kind ("analysis", "extraction",
+    "batch_extraction", "story", "validation") to a function of the human
+    message returning the response payload; other kinds get a default.
+    """
+    
+    model_name: str = "scripted"
+    responses: Dict[str, Callable[[str], Dict[str, Any]]] = Field(default_factory=dict)
+    calls: List[str] = Field(default_factory=list)
+    human_messages: List[str] = Field(default_factory=list)
+    
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+    
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        system = str(messages[0].content)
+        human = str(messages[-1].content)
+        kind = next(
+            (kind for kind, marker in _PROMPT_MARKERS if marker in system),
+            "unknown"
+        )
+        self.calls.append(kind)
+        self.human_messages.append(human)
+        
+        respond = self.responses.get(kind)
+        payload = respond(human) if respond else _default_response(kind, human)
+        message = AIMessage(content=json.dumps(payload))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Keep BaseNode's class-level LLM response cache from leaking between tests"""
+    BaseNode._response_cache.clear()
+    yield
+    BaseNode._response_cache.clear()
+
+
+@pytest.fixture
+def scripted_llm() -> Callable[..., ScriptedChatModel]:
+    """Factory for ScriptedChatModel instances (responses as keyword arguments)"""
+    def make(**responses: Callable[[str], Dict[str, Any]]) -> ScriptedChatModel:
+        return ScriptedChatModel(responses=responses)
+    return make
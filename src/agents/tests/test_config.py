@@ -0,0 +1,64 @@
+"""
+Test workflow configuration models and presets.
+"""
+import pytest
+from pydantic import ValidationError
+
+from agents.config import ValidationConfig, WorkflowConfig, get_default_config
+
+
+def test_partial_criteria_weights_replace_the_defaults():
+    """A supplied criteria_weights dict is used as given, not merged with the defaults."""
+    weights = {"factual_accuracy": 0.5, "completeness": 0.3, "clarity": 0.2}
+    
+    assert ValidationConfig(criteria_weights=weights).criteria_weights == weights
+
+
+def test_partial_quality_thresholds_replace_the_defaults():
+    """A supplied quality_thresholds dict is used as given, not merged with the defaults."""
+    thresholds = {"minimum_validation_score": 0.7}
+    
+    assert WorkflowConfig(quality_thresholds=thresholds).quality_thresholds == thresholds
+
+
+def test_default_dicts_are_not_shared():
+    """Each config gets its own copy of the default dicts."""
+    first, second = WorkflowConfig(), WorkflowConfig()
+    first.quality_thresholds["minimum_story_length"] = 1
+    
+    assert second.quality_thresholds["minimum_story_length"] == 200
+    assert ValidationConfig().criteria_weights["factual_accuracy"] == 0.3
+
+
+def test_shared_preset_is_read_only():
+    """get_default_config(mutable=False) returns one frozen instance per preset."""
+    shared = get_default_config("quality", mutable=False)
+    
+    assert get_default_config("quality", mutable=False) is shared
+    with pytest.raises(ValidationError):
+        shared.max_retries = 10
+    with pytest.raises(TypeError):
+        shared.quality_thresholds["minimum_story_length"] = 1
+    with pytest.raises(ValidationError):
+        shared.validation_settings.passing_score = 0.1
+    with pytest.raises(TypeError):
+        shared.validation_settings.criteria_weights["clarity"] = 1.0
+
+
+def test_mutable_preset_is_an_independent_copy():
+    """get_default_config() returns a modifiable copy that leaves the shared preset alone."""
+    config = get_default_config("quality")
+    config.max_retries = 10
+    config.quality_thresholds["minimum_story_length"] = 1
+    config.validation_settings.passing_score = 0.1
+    
+    shared = get_default_config("quality", mutable=False)
+    assert shared.max_retries == 3
+    assert shared.quality_thresholds["minimum_story_length"] == 500
+    assert shared.validation_settings.passing_score == 0.6
+
+
+def test_unknown_preset_is_rejected():
+    """Only the known presets are available."""
+    with pytest.raises(ValueError):
+        get_default_config("turbo")
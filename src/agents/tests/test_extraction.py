@@ -0,0 +1,84 @@
+"""
+Test section-based extraction in ExtractionNode.
+"""
+import asyncio
+
+from agents.nodes.extraction_node import ExtractionNode
+from agents.nodes.ingestion_node import IngestionNode, PARAGRAPHS_PER_SECTION
+from agents.state.agent_state import create_initial_state
+
+from .conftest import extraction_response
+
+
+PARAGRAPH = "John Smith announced that Acme Corp reported record profits in London. " * 10
+
+# Three sections of paragraphs, well over the single-call extraction budget
+LONG_DOCUMENT = "\n\n".join([PARAGRAPH] * (PARAGRAPHS_PER_SECTION * 2 + 1))
+
+
+def run_ingestion_and_extraction(llm, content):
+    """Run a document through ingestion and extraction with the given LLM."""
+    state = create_initial_state("doc", content, "source")
+    
+    async def run():
+        ingested = await IngestionNode(llm=llm)(state)
+        return await ExtractionNode(llm=llm)(ingested)
+    
+    return asyncio.run(run())
+
+
+def test_ingestion_shares_document_sections(scripted_llm):
+    """Sections are found in the raw text and stored where extraction reads them."""
+    state = create_initial_state("doc", LONG_DOCUMENT, "source")
+    state = asyncio.run(IngestionNode(llm=scripted_llm())(state))
+    
+    sections = ExtractionNode().get_context(state, "document_sections", [])
+    assert [section["title"] for section in sections] == ["Section 1", "Section 2", "Section 3"]
+    assert "\n" not in sections[0]["content"]
+
+
+def test_multi_section_document_uses_one_batched_call(scripted_llm):
+    """All sections of a long document are extracted with a single LLM call."""
+    llm = scripted_llm()
+    state = run_ingestion_and_extraction(llm, LONG_DOCUMENT)
+    
+    assert llm.calls == ["analysis", "batch_extraction"]
+    assert {entity.name for entity in state["extracted_entities"]} == {
+        "Person 0", "Person 1", "Person 2"
+    }
+
+
+def test_wrong_batched_result_count_falls_back_to_per_section_calls(scripted_llm):
+    """A batched response with too few results is replaced by one call per section."""
+    names = iter(["Alice Jones", "Bob Brown", "Carol White"])
+    llm = scripted_llm(
+        batch_extraction=lambda human: {"sections": [extraction_response("Nobody Here")]},
+        extraction=lambda human: extraction_response(next(names))
+    )
+    state = run_ingestion_and_extraction(llm, LONG_DOCUMENT)
+    
+    assert llm.calls == ["analysis", "batch_extraction"] + ["extraction"] * 3
+    # The per-section results are merged, the short batched one is discarded
+    assert {entity.name for entity in state["extracted_entities"]} == {
+        "Alice Jones", "Bob Brown", "Carol White"
+    }
+    assert len(state["extracted_facts"]) == 3
+
+
+def test_document_over_budget_is_extracted_in_full(scripted_llm):
+    """A document over the single-call budget takes the sections path, so its tail reaches the LLM."""
+    llm = scripted_llm()
+    document = LONG_DOCUMENT + "\n\n" + "Zelda Quinn closed the meeting in Paris."
+    run_ingestion_and_extraction(llm, document)
+    
+    assert llm.calls[-1] == "batch_extraction"
+    assert "Zelda Quinn" in llm.human_messages[-1]
+
+
+def test_document_within_budget_is_extracted_in_one_call(scripted_llm):
+    """A short document is sent whole, even when it has several sections."""
+    llm = scripted_llm()
+    document = "\n\n".join(["Short paragraph about John Smith."] * (PARAGRAPHS_PER_SECTION + 1))
+    run_ingestion_and_extraction(llm, document)
+    
+    assert llm.calls == ["analysis", "extraction"]
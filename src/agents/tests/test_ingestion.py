@@ -0,0 +1,32 @@
+"""
+Test text cleaning in IngestionNode.
+"""
+from agents.nodes.ingestion_node import IngestionNode, PARAGRAPHS_PER_SECTION
+
+
+def test_ocr_fix_applies_across_dropped_special_characters():
+    """Spaced letters separated by a dropped special character are still joined."""
+    assert IngestionNode()._clean_text("i • n.") == "in."
+
+
+def test_ocr_fix_joins_spaced_letters():
+    """Common OCR letter splits are joined."""
+    assert IngestionNode()._clean_text("t h e end a n d more") == "the end and more"
+
+
+def test_clean_text_leaves_clean_input_alone():
+    """Text without OCR damage comes through unchanged."""
+    assert IngestionNode(split_camel_case=False)._clean_text("Plain text about iPhone sales.") == (
+        "Plain text about iPhone sales."
+    )
+
+
+def test_segment_document_groups_paragraphs():
+    """Documents without headers are split into groups of PARAGRAPHS_PER_SECTION paragraphs."""
+    paragraphs = [f"Paragraph {i}." for i in range(PARAGRAPHS_PER_SECTION + 2)]
+    sections = IngestionNode()._segment_document("\n\n".join(paragraphs))
+    
+    assert [section["title"] for section in sections] == ["Section 1", "Section 2"]
+    assert sections[0]["content"] == "\n\n".join(paragraphs[:PARAGRAPHS_PER_SECTION])
+    assert sections[1]["content"] == "\n\n".join(paragraphs[PARAGRAPHS_PER_SECTION:])
+    assert [section["position"] for section in sections] == [0, 1]
@@ -0,0 +1,47 @@
+"""
+Test that retry loops in the workflow terminate.
+"""
+import asyncio
+
+from agents import create_workflow, get_default_config
+from agents.edges.router import prepare_extraction_retry, prepare_story_generation_retry
+from agents.state.agent_state import ProcessingStage, create_initial_state
+
+from .conftest import validation_response
+
+
+DOCUMENT = "John Smith announced that Acme Corp reported record profits in London. " * 20
+
+
+def test_prepare_retry_nodes_count_the_retry():
+    """Both retry-preparation nodes clear the flag and count the attempt."""
+    state = create_initial_state("doc", "text", "source")
+    state["should_retry"] = True
+    state["retry_count"] = 1
+    
+    assert prepare_story_generation_retry(state) == {"should_retry": False, "retry_count": 2}
+    update = prepare_extraction_retry(state)
+    assert update["should_retry"] is False
+    assert update["retry_count"] == 2
+    assert update["current_stage"] == ProcessingStage.EXTRACTION
+
+
+def test_failing_validation_stops_after_max_retries(scripted_llm):
+    """A validation that keeps failing retries story generation max_retries times, then fails."""
+    llm = scripted_llm(validation=lambda human: validation_response(0.5))
+    workflow = create_workflow(config=get_default_config("standard"), llm=llm)
+    
+    async def run():
+        try:
+            return await workflow.process_document("doc", DOCUMENT, "source")
+        finally:
+            await workflow.aclose()
+    
+    final_state = asyncio.run(run())
+    
+    max_retries = workflow.config.max_retries
+    assert final_state["current_stage"] == ProcessingStage.FAILED
+    assert final_state["retry_count"] == max_retries
+    # The first attempt plus one per retry
+    assert llm.calls.count("story") == max_retries + 1
+    assert llm.calls.count("validation") == max_retries + 1
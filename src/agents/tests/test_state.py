@@ -0,0 +1,41 @@
+"""
+Test agent state helpers and the error limit they feed.
+"""
+from agents.edges.router import should_continue
+from agents.state.agent_state import (
+    MAX_ERROR_MESSAGES,
+    ConfidenceScore,
+    add_error_message,
+    create_initial_state
+)
+
+
+def make_state():
+    """Initial state with enough confidence to pass should_continue's check."""
+    state = create_initial_state("doc", "text", "source")
+    state["confidence_scores"] = ConfidenceScore(overall=0.9)
+    return state
+
+
+def test_add_error_message_trims_messages_but_counts_all():
+    """Only the latest messages are kept, while error_count counts every error."""
+    state = make_state()
+    for i in range(MAX_ERROR_MESSAGES + 5):
+        add_error_message(state, f"error {i}")
+    
+    assert len(state["error_messages"]) == MAX_ERROR_MESSAGES
+    assert state["error_messages"][-1] == f"error {MAX_ERROR_MESSAGES + 4}"
+    assert state["error_count"] == MAX_ERROR_MESSAGES + 5
+
+
+def test_max_errors_above_message_limit_is_honoured():
+    """A max_errors higher than MAX_ERROR_MESSAGES is not clamped."""
+    state = make_state()
+    state["agent_context"]["max_errors"] = 50
+    
+    for _ in range(50):
+        add_error_message(state, "error")
+    assert should_continue(state)
+    
+    add_error_message(state, "error")
+    assert not should_continue(state)
@@ -0,0 +1,113 @@
+"""
+Test complete runs of StoneSoupWorkflow.
+"""
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from agents import WorkflowConfig, create_workflow, get_default_config, main_graph
+from agents.state.agent_state import ProcessingStage
+
+
+DOCUMENT = "John Smith announced that Acme Corp reported record profits in London. " * 20
+
+
+def run_workflow(workflow, coroutine_factory):
+    """Run a coroutine using the workflow, then close its checkpointer."""
+    async def run():
+        try:
+            return await coroutine_factory()
+        finally:
+            await workflow.aclose()
+    
+    return asyncio.run(run())
+
+
+def test_minimal_preset_completes(scripted_llm):
+    """The minimal preset skips story generation and still ends COMPLETED."""
+    llm = scripted_llm()
+    workflow = create_workflow(config=get_default_config("minimal"), llm=llm)
+    
+    final_state = run_workflow(
+        workflow,
+        lambda: workflow.process_document("doc", DOCUMENT, "source")
+    )
+    
+    assert final_state["current_stage"] == ProcessingStage.COMPLETED
+    assert final_state["extracted_entities"]
+    assert "story" not in llm.calls
+    assert "validation" not in llm.calls
+
+
+def test_workflow_state_is_readable_sync_and_async(scripted_llm):
+    """Both the blocking and the async state accessors see a finished run."""
+    workflow = create_workflow(config=get_default_config("standard"), llm=scripted_llm())
+    
+    async def run():
+        await workflow.process_document("doc", DOCUMENT, "source")
+        return (
+            await workflow.aget_workflow_state("doc"),
+            await workflow.aget_workflow_history("doc"),
+            # The blocking accessors must run off the workflow's event loop
+            await asyncio.to_thread(workflow.get_workflow_state, "doc"),
+            await asyncio.to_thread(workflow.get_workflow_history, "doc")
+        )
+    
+    state, history, sync_state, sync_history = run_workflow(workflow, run)
+    
+    assert state["current_stage"] == ProcessingStage.COMPLETED
+    assert sync_state["current_stage"] == ProcessingStage.COMPLETED
+    # One checkpoint per step by default
+    assert len(history) > 1
+    assert len(sync_history) == len(history)
+
+
+def test_workflow_state_before_any_run_is_empty():
+    """The blocking accessors return nothing before the checkpointer is opened."""
+    workflow = create_workflow()
+    
+    assert workflow.get_workflow_state("doc") is None
+    assert workflow.get_workflow_history("doc") == []
+
+
+def test_process_batch_returns_states_in_document_order(scripted_llm):
+    """Results line up with the input documents, however the workers interleave."""
+    workflow = create_workflow(config=get_default_config("standard"), llm=scripted_llm())
+    documents = [
+        {"document_id": f"doc_{i}", "content": DOCUMENT * (i % 3 + 1), "source": "source"}
+        for i in range(7)
+    ]
+    
+    results = run_workflow(
+        workflow,
+        lambda: workflow.process_batch(documents, max_concurrent=3)
+    )
+    
+    assert [state["document_id"] for state in results] == [doc["document_id"] for doc in documents]
+    assert all(state["current_stage"] == ProcessingStage.COMPLETED for state in results)
+
+
+def test_process_batch_rejects_non_positive_concurrency():
+    """max_concurrent below 1 is an error rather than a batch of None results."""
+    workflow = create_workflow()
+    documents = [{"document_id": "doc", "content": DOCUMENT, "source": "source"}]
+    
+    with pytest.raises(ValueError):
+        run_workflow(workflow, lambda: workflow.process_batch(documents, max_concurrent=0))
+
+
+def test_create_workflow_cache_is_opt_in_and_keyed_by_config(monkeypatch):
+    """use_cache reuses workflows for equal configs only; without it every call builds anew."""
+    monkeypatch.setattr(main_graph, "_WORKFLOW_CACHE", OrderedDict())
+    config = WorkflowConfig(max_retries=2)
+    
+    cached = create_workflow(config=config, use_cache=True)
+    
+    assert create_workflow(config=WorkflowConfig(max_retries=2), use_cache=True) is cached
+    assert create_workflow(config=WorkflowConfig(max_retries=4), use_cache=True) is not cached
+    assert create_workflow(config=config) is not cached
+    
+    # The cached workflow keeps its own snapshot of the config
+    config.max_retries = 5
+    assert cached.config.max_retries == 2